@@ -3,83 +3,139 @@ Configuration settings for the Subscription Page Analyzer.
 Loads environment variables and validates required settings.
 """
 
+import atexit
 import os
 import logging
+import queue
+import threading
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, List
+from types import MappingProxyType
+from typing import List, Mapping, Optional
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
+# Load environment variables from .env file; variables already set in the
+# environment (e.g. by production containers) take precedence
 load_dotenv()
 
+# Models whose prompt cache accepts the analysis instructions (about 1.2k tokens);
+# Claude 3 Sonnet has no prompt caching and Haiku models need a 2048-token prefix
+PROMPT_CACHING_MODELS = frozenset({
+    'claude-3-5-sonnet-20241022', 'claude-3-5-sonnet-20240620', 'claude-3-opus-20240229'
+})
+
+# Background thread that writes log records, started by the first Settings instance
+_log_listener: Optional[QueueListener] = None
+_log_listener_lock = threading.Lock()
+
+# Set once the runtime directories are known to exist in this process
+_DIRS_READY = False
+
+# Language name mapping (read-only, shared by all Settings instances)
+_LANGUAGE_NAMES = MappingProxyType({
+    'cs': 'Czech',
+    'pl': 'Polish', 
+    'sk': 'Slovak',
+    'hu': 'Hungarian',
+    'ro': 'Romanian',
+    'de': 'German',
+    'es': 'Spanish',
+    'fr': 'French',
+    'lt': 'Lithuanian',
+    'lv': 'Latvian',
+    'pt': 'Portuguese',
+    'nl': 'Dutch',
+    'sv': 'Swedish',
+    'da': 'Danish',
+    'fi': 'Finnish',
+    'no': 'Norwegian',
+    'en': 'English',
+    'auto': 'Auto-detect'
+})
+
+
+@lru_cache(maxsize=64)
+def get_language_name(lang_code: str) -> str:
+    """Get human-readable language name from code."""
+    return _LANGUAGE_NAMES.get(lang_code, lang_code.upper())
+
+
+def _env_flag(value: str) -> bool:
+    """Interpret an environment variable value as a boolean."""
+    return value.lower() == 'true'
+
+
 class Settings:
     """Application settings loaded from environment variables."""
     
-    def __init__(self):
-        self._validate_required_settings()
-        self._setup_logging()
-    
-    # Anthropic API Configuration
-    ANTHROPIC_API_KEY: str = os.getenv('ANTHROPIC_API_KEY', '')
-    CLAUDE_MODEL: str = os.getenv('CLAUDE_MODEL', 'claude-3-sonnet-20240229')
-    
-    # Analysis Configuration
-    ANALYSIS_MODE: str = os.getenv('ANALYSIS_MODE', 'claude_only')
-    MAX_CONCURRENT_ANALYSES: int = int(os.getenv('MAX_CONCURRENT_ANALYSES', '3'))
-    CACHE_ANALYSES: bool = os.getenv('CACHE_ANALYSES', 'true').lower() == 'true'
-    CACHE_EXPIRY_HOURS: int = int(os.getenv('CACHE_EXPIRY_HOURS', '24'))
-    
-    # Flask Configuration
-    FLASK_SECRET_KEY: str = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
-    FLASK_DEBUG: bool = os.getenv('FLASK_DEBUG', 'false').lower() == 'true'
-    FLASK_PORT: int = int(os.getenv('FLASK_PORT', '5001'))
-    
-    # Logging Configuration
-    LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
-    LOG_FILE: str = os.getenv('LOG_FILE', 'logs/analyzer.log')
-    
-    # Rate Limiting
-    API_RATE_LIMIT_PER_MINUTE: int = int(os.getenv('API_RATE_LIMIT_PER_MINUTE', '60'))
-    REQUEST_TIMEOUT_SECONDS: int = int(os.getenv('REQUEST_TIMEOUT_SECONDS', '120'))
-    
-    # Language Configuration  
-    DEFAULT_LANGUAGE: str = os.getenv('DEFAULT_LANGUAGE', 'auto')
-    _SUPPORTED_LANGUAGES_STR: str = os.getenv(
-        'SUPPORTED_LANGUAGES', 
-        'cs,pl,sk,hu,ro,de,es,fr,lt,lv,pt,nl,sv,da,fi,no,en'
-    )
-    
-    # Parse supported languages
-    SUPPORTED_LANGUAGES: List[str] = [lang.strip() for lang in _SUPPORTED_LANGUAGES_STR.split(',')]
-    
     # Language name mapping
-    LANGUAGE_NAMES: Dict[str, str] = {
-        'cs': 'Czech',
-        'pl': 'Polish', 
-        'sk': 'Slovak',
-        'hu': 'Hungarian',
-        'ro': 'Romanian',
-        'de': 'German',
-        'es': 'Spanish',
-        'fr': 'French',
-        'lt': 'Lithuanian',
-        'lv': 'Latvian',
-        'pt': 'Portuguese',
-        'nl': 'Dutch',
-        'sv': 'Swedish',
-        'da': 'Danish',
-        'fi': 'Finnish',
-        'no': 'Norwegian',
-        'en': 'English',
-        'auto': 'Auto-detect'
-    }
+    LANGUAGE_NAMES: Mapping[str, str] = _LANGUAGE_NAMES
     
     # File paths
     PROJECT_ROOT: Path = Path(__file__).parent.parent
     CACHE_DIR: Path = PROJECT_ROOT / 'cache' / 'analyses'
+    SCRAPE_CACHE_DIR: Path = PROJECT_ROOT / 'cache' / 'scrapes'
     LOGS_DIR: Path = PROJECT_ROOT / 'logs'
     RESULTS_DIR: Path = PROJECT_ROOT / 'results'
     
+    def __init__(self, env: Optional[Mapping[str, str]] = None):
+        """
+        Read configuration from a single snapshot of the environment.
+        
+        Args:
+            env: Mapping to read variables from (defaults to os.environ)
+        """
+        env = dict(os.environ if env is None else env)
+        get = env.get
+        
+        # Anthropic API Configuration
+        self.ANTHROPIC_API_KEY: str = get('ANTHROPIC_API_KEY', '')
+        self.CLAUDE_MODEL: str = get('CLAUDE_MODEL', 'claude-3-5-sonnet-20241022')
+        
+        # Analysis Configuration
+        self.ANALYSIS_MODE: str = get('ANALYSIS_MODE', 'claude_only')
+        self.MAX_CONCURRENT_ANALYSES: int = int(get('MAX_CONCURRENT_ANALYSES', '3'))
+        # Pages fetched at once by the CLI; scraping overlaps with the slower Claude calls
+        self.MAX_CONCURRENT_SCRAPES: int = int(get('MAX_CONCURRENT_SCRAPES', '8'))
+        self.CACHE_ANALYSES: bool = _env_flag(get('CACHE_ANALYSES', 'true'))
+        self.CACHE_EXPIRY_HOURS: int = int(get('CACHE_EXPIRY_HOURS', '24'))
+        self.CACHE_SCRAPES: bool = _env_flag(get('CACHE_SCRAPES', 'true'))
+        self.SCRAPE_CACHE_EXPIRY_HOURS: int = int(get('SCRAPE_CACHE_EXPIRY_HOURS', '24'))
+        
+        # Flask Configuration
+        self.FLASK_SECRET_KEY: str = get('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
+        self.FLASK_DEBUG: bool = _env_flag(get('FLASK_DEBUG', 'false'))
+        self.FLASK_PORT: int = int(get('FLASK_PORT', '5001'))
+        
+        # Logging Configuration
+        self.LOG_LEVEL: str = get('LOG_LEVEL', 'INFO')
+        self.LOG_FILE: str = get('LOG_FILE', 'logs/analyzer.log')
+        
+        # Rate Limiting
+        self.API_RATE_LIMIT_PER_MINUTE: int = int(get('API_RATE_LIMIT_PER_MINUTE', '60'))
+        # Input plus output tokens per minute for the account's tier; 0 disables the limit
+        self.API_TOKENS_PER_MINUTE: int = int(get('API_TOKENS_PER_MINUTE', '0'))
+        self.REQUEST_TIMEOUT_SECONDS: int = int(get('REQUEST_TIMEOUT_SECONDS', '120'))
+        
+        # Page text sent to Claude is cut to roughly this many tokens
+        self.MAX_INPUT_TOKENS: int = int(get('MAX_INPUT_TOKENS', '8000'))
+        
+        # Language Configuration
+        self.DEFAULT_LANGUAGE: str = get('DEFAULT_LANGUAGE', 'auto')
+        self.SUPPORTED_LANGUAGES: List[str] = [
+            lang.strip()
+            for lang in get('SUPPORTED_LANGUAGES', 'cs,pl,sk,hu,ro,de,es,fr,lt,lv,pt,nl,sv,da,fi,no,en').split(',')
+        ]
+        self._SUPPORTED_LANGUAGE_SET = frozenset(self.SUPPORTED_LANGUAGES) | {'auto'}
+        
+        # Optional fastText language-identification model (e.g. lid.176.ftz)
+        self.LID_MODEL_PATH: str = get('LID_MODEL_PATH', '')
+        self.LID_CONFIDENCE_THRESHOLD: float = float(get('LID_CONFIDENCE_THRESHOLD', '0.85'))
+        
+        self._validate_required_settings()
+        self._setup_logging()
+    
     def _validate_required_settings(self):
         """Validate that all required settings are present."""
         if not self.ANTHROPIC_API_KEY:
@@ -92,43 +148,96 @@ class Settings:
                 "ANTHROPIC_API_KEY appears to be invalid. It should start with 'sk-ant-'"
             )
         
-        if self.CLAUDE_MODEL not in ['claude-3-sonnet-20240229', 'claude-3-opus-20240229', 'claude-3-haiku-20240307']:
-            logging.warning(f"Unusual Claude model specified: {self.CLAUDE_MODEL}")
+        if self.CLAUDE_MODEL not in PROMPT_CACHING_MODELS:
+            logging.warning(
+                f"Claude model {self.CLAUDE_MODEL} will not cache the analysis instructions; "
+                f"every request pays for them in full"
+            )
     
     def _setup_logging(self):
-        """Set up logging configuration."""
-        # Create logs directory if it doesn't exist
-        self.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+        """
+        Set up logging configuration.
+        
+        The handlers and their listener thread are created once per process;
+        later instances only apply their log level.
+        """
+        global _log_listener
         
         # Set up logging level
         log_level = getattr(logging, self.LOG_LEVEL.upper(), logging.INFO)
         
-        # Configure logging
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(self.LOGS_DIR / 'analyzer.log'),
-                logging.StreamHandler()
-            ]
-        )
+        with _log_listener_lock:
+            if _log_listener is not None:
+                logging.getLogger().setLevel(log_level)
+                return
+            
+            # Create logs directory if it doesn't exist
+            self.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+            
+            # Handlers run on a background listener thread; callers only enqueue records
+            log_queue = queue.Queue(-1)
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            file_handler = logging.FileHandler(self.LOGS_DIR / 'analyzer.log')
+            stream_handler = logging.StreamHandler()
+            for handler in (file_handler, stream_handler):
+                handler.setFormatter(formatter)
+            
+            _log_listener = QueueListener(log_queue, file_handler, stream_handler)
+            _log_listener.start()
+            atexit.register(_log_listener.stop)
+            
+            # Configure logging; records are formatted by the listener's handlers
+            logging.basicConfig(
+                level=log_level,
+                format='%(message)s',
+                handlers=[QueueHandler(log_queue)],
+                force=True
+            )
     
     def create_directories(self):
         """Create necessary directories."""
-        directories = [self.CACHE_DIR, self.LOGS_DIR, self.RESULTS_DIR]
+        global _DIRS_READY
+        if _DIRS_READY:
+            return
+        
+        directories = [self.CACHE_DIR, self.SCRAPE_CACHE_DIR, self.LOGS_DIR, self.RESULTS_DIR]
         for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
+            if not directory.is_dir():
+                directory.mkdir(parents=True, exist_ok=True)
+        _DIRS_READY = True
+    
+    def bootstrap(self):
+        """Prepare the runtime environment. Call once from entry points."""
+        self.create_directories()
     
     def get_language_name(self, lang_code: str) -> str:
         """Get human-readable language name from code."""
-        return self.LANGUAGE_NAMES.get(lang_code, lang_code.upper())
+        return get_language_name(lang_code)
     
     def is_supported_language(self, lang_code: str) -> bool:
         """Check if a language code is supported."""
-        return lang_code in self.SUPPORTED_LANGUAGES or lang_code == 'auto'
+        return lang_code in self._SUPPORTED_LANGUAGE_SET
+
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """Return the shared settings instance, creating it on first use."""
+    global _settings
+    if _settings is None:
+        # Locked so concurrent first users (e.g. a warm-up import thread)
+        # cannot construct two instances and set up logging twice
+        with _settings_lock:
+            if _settings is None:
+                _settings = Settings()
+    return _settings
 
-# Create global settings instance
-settings = Settings()
 
-# Create directories on import
-settings.create_directories()
\ No newline at end of file
+def __getattr__(name):
+    # Keep `from config.settings import settings` working while deferring
+    # construction until the name is actually requested
+    if name == 'settings':
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
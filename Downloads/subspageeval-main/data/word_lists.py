@@ -3,6 +3,9 @@ Word lists and patterns for subscription page linguistic analysis.
 All lists are lowercase for case-insensitive matching.
 """
 
+import re
+from typing import List, Tuple
+
 # Motivation Framework
 SUPPORT_TERMS = [
     'support', 'contribute', 'fund', 'enable', 'help', 'sustain', 
@@ -143,4 +146,39 @@ PRICE_PATTERNS = [
     r'\d+\.?\d*\s*(dollar|pound|euro|usd|gbp|eur)',
     r'(free|complimentary)\s+(trial|access|month|week|period)',
     r'\d+\s*(day|week|month|year)s?\s+(free|trial|access)',
-]
\ No newline at end of file
+]
+
+
+def _union(patterns) -> re.Pattern:
+    """Compile a list of regex patterns into one alternation."""
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE | re.UNICODE)
+
+
+# Precompiled alternations so callers scan the text once per pattern family
+SOCIAL_PROOF_RE = _union(SOCIAL_PROOF_PATTERNS)
+PRICE_RE = _union(PRICE_PATTERNS)
+
+# Named-group variant used to recover which price pattern matched
+_PRICE_TAGGED_RE = re.compile(
+    '|'.join(f'(?P<p{i}>{p})' for i, p in enumerate(PRICE_PATTERNS)),
+    re.IGNORECASE | re.UNICODE
+)
+
+
+def scan_prices(text: str) -> List[Tuple[int, int, int]]:
+    """
+    Find price mentions using PRICE_PATTERNS.
+
+    Matches are non-overlapping, leftmost first, with the earliest pattern
+    winning ties; offsets are character offsets into text.
+
+    Args:
+        text: Text to scan
+
+    Returns:
+        List of (pattern_id, start, end) tuples ordered by start offset
+    """
+    return [
+        (int(m.lastgroup[1:]), m.start(), m.end())
+        for m in _PRICE_TAGGED_RE.finditer(text)
+    ]
@@ -11,30 +11,65 @@ import sys
 # Add the project directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def open_browser():
+def open_browser(url):
     """Open browser after a short delay"""
     time.sleep(2)  # Wait for server to start
-    webbrowser.open('http://localhost:5001')
+    webbrowser.open(url)
     print("\n" + "="*50)
     print("Web app should open in your browser automatically.")
-    print("If not, manually navigate to: http://localhost:5001")
+    print(f"If not, manually navigate to: {url}")
     print("="*50 + "\n")
 
-# Start browser opening in background
-browser_thread = threading.Thread(target=open_browser)
-browser_thread.daemon = True
-browser_thread.start()
+def launch_browser(url):
+    """Open the browser from a detached child process, or a thread where fork is unavailable"""
+    if not hasattr(os, 'fork'):
+        threading.Thread(target=open_browser, args=(url,), daemon=True).start()
+        return
+    
+    # Flush so the child does not replay buffered output
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        # Fork again so the grandchild is reparented and never left as a zombie
+        if os.fork() == 0:
+            try:
+                open_browser(url)
+            finally:
+                os._exit(0)
+        os._exit(0)
+    os.waitpid(pid, 0)
 
 # Import and run the Flask app
 try:
+    # Importing the settings module only loads .env; fork before anything
+    # starts threads (logging, the web app) so the child inherits no locks
+    import config.settings
+    
+    # Start browser opening in background, only for interactive sessions
+    if sys.stdout.isatty():
+        launch_browser(f"http://localhost:{os.environ.get('FLASK_PORT', '5001')}")
+    
     from web_app import app
+    from config.settings import settings
+    settings.bootstrap()
+    url = f'http://localhost:{settings.FLASK_PORT}'
+    
     print("Starting Subscription Page Analyzer...")
-    print("Server running on http://localhost:5001")
-    # Run with host 0.0.0.0 to ensure it's accessible
-    app.run(debug=True, port=5001, host='0.0.0.0', use_reloader=False)
+    print(f"Server running on {url}")
+    try:
+        from waitress import serve
+    except ImportError:
+        # Fall back to Flask's built-in server; threaded so requests overlap
+        app.run(debug=settings.FLASK_DEBUG, port=settings.FLASK_PORT, host='0.0.0.0',
+                use_reloader=False, threaded=True)
+    else:
+        # Run with host 0.0.0.0 to ensure it's accessible
+        serve(app, host='0.0.0.0', port=settings.FLASK_PORT,
+              threads=settings.MAX_CONCURRENT_ANALYSES * 2)
 except Exception as e:
     print(f"Error starting web app: {e}")
     print("\nTroubleshooting:")
     print("1. Ensure all dependencies are installed: pip3 install -r requirements.txt")
     print("2. Check if port 5001 is already in use")
-    print("3. Try running: python3 web_app.py directly")
\ No newline at end of file
+    print("3. Try running: python3 web_app.py directly")
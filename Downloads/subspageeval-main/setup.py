@@ -4,7 +4,9 @@ Setup script for the Multilingual Subscription Page Analyzer.
 Handles environment setup, dependency installation, and configuration.
 """
 
+import hashlib
 import os
+import re
 import sys
 import subprocess
 import shutil
@@ -28,19 +30,28 @@ def check_python_version():
 
 def check_tesseract():
     """Check if Tesseract OCR is installed."""
-    try:
-        result = subprocess.run(['tesseract', '--version'], 
-                              capture_output=True, text=True, check=True)
-        version = result.stdout.split('\n')[0]
-        print(f"✅ Tesseract OCR: {version}")
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("⚠️  Tesseract OCR not found")
-        print("   Please install Tesseract OCR:")
-        print("   - macOS: brew install tesseract")
-        print("   - Ubuntu/Debian: sudo apt-get install tesseract-ocr")
-        print("   - Windows: Download from https://github.com/UB-Mannheim/tesseract/wiki")
-        return False
+    # Only spawn tesseract once we know it is on PATH
+    tesseract_path = shutil.which('tesseract')
+    if tesseract_path:
+        try:
+            result = subprocess.run([tesseract_path, '--version'], 
+                                  capture_output=True, text=True, check=True)
+            version = result.stdout.split('\n')[0]
+            print(f"✅ Tesseract OCR: {version}")
+            return True
+        except (subprocess.CalledProcessError, OSError):
+            pass
+    
+    print("⚠️  Tesseract OCR not found")
+    print("   Please install Tesseract OCR:")
+    print("   - macOS: brew install tesseract")
+    print("   - Ubuntu/Debian: sudo apt-get install tesseract-ocr")
+    print("   - Windows: Download from https://github.com/UB-Mannheim/tesseract/wiki")
+    return False
+
+def _file_digest(path):
+    """Return a BLAKE2b digest of a file's contents."""
+    return hashlib.blake2b(path.read_bytes()).digest()
 
 def create_env_file():
     """Create .env file from template if it doesn't exist."""
@@ -48,15 +59,19 @@ def create_env_file():
     template_file = Path('.env.template')
     
     if env_file.exists():
-        print("✅ .env file already exists")
+        if template_file.exists() and _file_digest(env_file) == _file_digest(template_file):
+            print("⚠️  .env file already exists but is unchanged from the template")
+        else:
+            print("✅ .env file already exists")
         return True
     
     if not template_file.exists():
         print("❌ Error: .env.template file not found")
         return False
     
-    # Copy template to .env
-    shutil.copy(template_file, env_file)
+    # Copy template to .env (copyfile uses the kernel's zero-copy path where available).
+    # Not a hardlink: editing .env must never modify the template.
+    shutil.copyfile(template_file, env_file)
     print("✅ Created .env file from template")
     
     # Prompt for API key
@@ -70,24 +85,29 @@ def create_env_file():
 def install_dependencies():
     """Install Python dependencies."""
     print("\n📦 Installing Python dependencies...")
+    pip_args = ['install', '-r', 'requirements.txt']
     try:
-        subprocess.run([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'], 
-                      check=True)
+        # Run pip in this interpreter instead of spawning a new one
+        from pip._internal.cli.main import main as pip_main
+        returncode = pip_main(pip_args)
+    except ImportError:
+        returncode = subprocess.run([sys.executable, '-m', 'pip', *pip_args]).returncode
+    
+    if returncode == 0:
         print("✅ Python dependencies installed successfully")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error installing dependencies: {e}")
-        return False
+    
+    print(f"❌ Error installing dependencies: pip exited with status {returncode}")
+    return False
 
 def install_playwright():
     """Install Playwright browsers."""
     print("\n🎭 Installing Playwright browsers...")
     try:
-        subprocess.run([sys.executable, '-m', 'playwright', 'install', 'chromium'], 
-                      check=True)
+        subprocess.run([sys.executable, '-m', 'playwright', 'install', 'chromium'], check=True)
         print("✅ Playwright browsers installed successfully")
         return True
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, OSError) as e:
         print(f"❌ Error installing Playwright browsers: {e}")
         return False
 
@@ -95,6 +115,7 @@ def create_directories():
     """Create necessary directories."""
     directories = [
         'cache/analyses',
+        'cache/scrapes',
         'logs',
         'results',
         'templates',
@@ -102,27 +123,40 @@ def create_directories():
         'static/js'
     ]
     
-    for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
+    for directory in map(Path, directories):
+        if not directory.is_dir():
+            directory.mkdir(parents=True, exist_ok=True)
     
     print("✅ Created necessary directories")
 
+# Shape of an Anthropic API key; checked before importing the SDK
+API_KEY_PATTERN = re.compile(r'^sk-ant-[A-Za-z0-9_-]{20,}$')
+PLACEHOLDER_API_KEY = 'sk-ant-api03-YOUR-KEY-HERE'
+
+def _configured_api_key():
+    """Return the API key from the environment or the .env file."""
+    key = os.environ.get('ANTHROPIC_API_KEY')
+    if not key:
+        from dotenv import dotenv_values
+        key = dotenv_values('.env').get('ANTHROPIC_API_KEY')
+    return (key or '').strip()
+
 def run_initial_test():
     """Run initial configuration test."""
     print("\n🧪 Testing configuration...")
     
+    # Validate the key format before paying for the SDK imports
+    key = _configured_api_key()
+    if key == PLACEHOLDER_API_KEY or not API_KEY_PATTERN.match(key):
+        print("⚠️  Warning: Please configure your Anthropic API key in .env file")
+        return False
+    
     try:
         # Test imports
         from config.settings import settings
         from utils.claude_analyzer import ClaudeAnalyzer
         
         print("✅ Configuration imports successful")
-        
-        # Check API key
-        if not settings.ANTHROPIC_API_KEY or settings.ANTHROPIC_API_KEY == 'sk-ant-api03-YOUR-KEY-HERE':
-            print("⚠️  Warning: Please configure your Anthropic API key in .env file")
-            return False
-        
         print("✅ Anthropic API key configured")
         print(f"✅ Supported languages: {len(settings.SUPPORTED_LANGUAGES)}")
         
@@ -9,101 +9,151 @@ import argparse
 import logging
 import os
 import sys
-from datetime import datetime
-from typing import List, Dict
-
-from utils.enhanced_scraper import scrape_page_enhanced
-from utils.text_processor import clean_text
-from utils.analyzer import analyze_text
-from utils.reporter import (
-    save_individual_report,
-    generate_comparative_csv,
-    generate_summary_report,
-    log_error,
-    save_progress
-)
-
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from itertools import islice
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from config.settings import get_settings
+
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between progress file writes
+PROGRESS_SAVE_INTERVAL = 2.0
+
+# Drops embedded line breaks from CSV fields in a single pass
+_STRIP = str.maketrans('', '', '\r\n')
+
 
-def read_input_csv(filepath: str) -> List[Dict[str, str]]:
+def _clean_field(value: str) -> str:
+    """Remove line breaks and surrounding blanks from a CSV field."""
+    return value.translate(_STRIP).strip(' \t')
+
+
+def normalize_url(url: str) -> str:
     """
-    Read publisher information from CSV file.
+    Lowercase the scheme and host of a URL, leaving path and query untouched.
     
     Args:
-        filepath: Path to CSV file
+        url: URL as read from the input file
         
     Returns:
-        List of dictionaries with publisher info
+        Normalized URL
     """
-    publishers = []
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(scheme=parts.scheme.lower(), netloc=parts.netloc.lower()))
+
+
+def iter_publishers(filepath: str) -> Iterator[Dict[str, str]]:
+    """
+    Stream publisher information from CSV file.
     
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if 'publisher_name' in row and 'subscription_url' in row:
-                    publishers.append({
-                        'name': row['publisher_name'].strip(),
-                        'url': row['subscription_url'].strip(),
-                        'language': row.get('language', 'en').strip()
-                    })
-        
-        logger.info(f"Read {len(publishers)} publishers from {filepath}")
-        return publishers
+    Rows missing a publisher name or URL are skipped.
+    
+    Args:
+        filepath: Path to CSV file
         
-    except Exception as e:
-        logger.error(f"Failed to read input CSV: {e}")
-        return []
+    Yields:
+        Dictionaries with publisher info
+    """
+    with open(filepath, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            try:
+                yield {
+                    'name': _clean_field(row['publisher_name']),
+                    'url': normalize_url(_clean_field(row['subscription_url'])),
+                    'language': _clean_field(row.get('language') or 'en').lower()
+                }
+            except (KeyError, AttributeError):
+                continue
+
+
+@lru_cache(maxsize=1)
+def _pipeline() -> SimpleNamespace:
+    """
+    Import the scraping and analysis stack on first use.
+    
+    These modules pull in Playwright and the Anthropic client, so keeping
+    them out of module scope lets --help and input errors return quickly.
+    
+    Returns:
+        Namespace with the pipeline functions
+    """
+    from utils.enhanced_scraper import scrape_page_enhanced
+    from utils.text_processor import clean_text
+    from utils.analyzer import analyze_text
+    from utils.reporter import (
+        save_individual_report,
+        sort_results,
+        generate_comparative_csv,
+        generate_summary_report,
+        log_error,
+        save_progress
+    )
+    return SimpleNamespace(
+        scrape_page_enhanced=scrape_page_enhanced,
+        clean_text=clean_text,
+        analyze_text=analyze_text,
+        save_individual_report=save_individual_report,
+        sort_results=sort_results,
+        generate_comparative_csv=generate_comparative_csv,
+        generate_summary_report=generate_summary_report,
+        log_error=log_error,
+        save_progress=save_progress
+    )
 
 
-def process_publisher(publisher: Dict[str, str], output_dir: str) -> Dict:
+def process_publisher(publisher: Dict[str, str], output_dir: str,
+                      analysis_slots: Optional[threading.Semaphore] = None) -> Dict:
     """
     Process a single publisher's subscription page.
     
     Args:
         publisher: Publisher information
         output_dir: Directory for output files
+        analysis_slots: Semaphore bounding concurrent Claude analyses (optional)
         
     Returns:
         Analysis results or None if failed
     """
     logger.info(f"Processing {publisher['name']}...")
+    pipeline = _pipeline()
     
     try:
         # Scrape the page with enhanced scraper
-        text, screenshot, metadata = scrape_page_enhanced(publisher['url'])
+        text, screenshot, metadata = pipeline.scrape_page_enhanced(publisher['url'], publisher['language'])
         
         if not text:
             error_msg = f"Failed to scrape {publisher['name']} at {publisher['url']}"
             logger.error(error_msg)
-            log_error(error_msg, output_dir)
+            pipeline.log_error(error_msg, output_dir)
             return None
         
         # Clean the text
-        cleaned_text = clean_text(text)
+        cleaned_text = pipeline.clean_text(text)
         
-        # Analyze the text
-        results = analyze_text(cleaned_text, publisher['name'])
+        # Analyze the text; scraping in other workers continues while this waits
+        with analysis_slots or nullcontext():
+            results = pipeline.analyze_text(cleaned_text, publisher['name'])
         results['url'] = publisher['url']
         results['language'] = publisher['language']
         results['screenshot'] = screenshot
         results['metadata'] = metadata
         
         # Save individual report
-        save_individual_report(results, output_dir)
+        pipeline.save_individual_report(results, output_dir)
         
         return results
         
     except Exception as e:
         error_msg = f"Error processing {publisher['name']}: {str(e)}"
         logger.error(error_msg)
-        log_error(error_msg, output_dir)
+        pipeline.log_error(error_msg, output_dir)
         return None
 
 
@@ -130,63 +180,90 @@ def main():
     
     args = parser.parse_args()
     
+    settings = get_settings()
+    settings.bootstrap()
+    pipeline = _pipeline()
+    
     # Create output directory if it doesn't exist
     os.makedirs(args.output, exist_ok=True)
     
-    # Read input publishers
-    publishers = read_input_csv(args.input)
-    
-    if not publishers:
-        logger.error("No publishers found in input file")
-        return
+    # Read input publishers lazily
+    publishers = iter_publishers(args.input)
     
     # Apply limit if specified
     if args.limit:
-        publishers = publishers[:args.limit]
-        logger.info(f"Limited to {len(publishers)} publishers")
+        publishers = islice(publishers, args.limit)
+        logger.info(f"Limited to {args.limit} publishers")
     
-    # Process each publisher
+    # Process publishers concurrently; each one is dominated by network I/O.
+    # Scrapes run up to MAX_CONCURRENT_SCRAPES wide while Claude calls are
+    # capped separately, so fetching later pages overlaps with analysis
+    analysis_slots = threading.BoundedSemaphore(settings.MAX_CONCURRENT_ANALYSES)
+    max_workers = max(settings.MAX_CONCURRENT_SCRAPES, settings.MAX_CONCURRENT_ANALYSES)
     all_results = []
     failed_count = 0
     
-    start_time = datetime.now()
+    start_time = time.perf_counter()
+    last_save = 0.0
     
-    for i, publisher in enumerate(publishers, 1):
-        logger.info(f"Processing {i}/{len(publishers)}: {publisher['name']}")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        try:
+            for publisher in publishers:
+                futures[executor.submit(process_publisher, publisher, args.output, analysis_slots)] = publisher
+        except (OSError, csv.Error) as e:
+            logger.error(f"Failed to read input CSV: {e}")
         
-        results = process_publisher(publisher, args.output)
+        total = len(futures)
+        if not total:
+            logger.error("No publishers found in input file")
+            return
         
-        if results:
-            all_results.append(results)
-            # Save progress after each successful analysis
-            save_progress({
-                'processed': i,
-                'total': len(publishers),
-                'successful': len(all_results),
-                'failed': failed_count
-            }, args.output)
-        else:
-            failed_count += 1
+        logger.info(f"Read {total} publishers from {args.input}")
         
-        # Log progress
-        if i % 5 == 0:
-            elapsed = (datetime.now() - start_time).total_seconds()
-            rate = i / elapsed * 60  # publishers per minute
-            logger.info(f"Progress: {i}/{len(publishers)} ({rate:.1f} publishers/min)")
+        # Results are consumed on this thread only, so counters need no locking
+        for i, future in enumerate(as_completed(futures), 1):
+            publisher = futures[future]
+            results = future.result()
+            
+            if results:
+                all_results.append(results)
+            else:
+                failed_count += 1
+            
+            # Save progress periodically, and always after the last publisher
+            now = time.perf_counter()
+            if now - last_save > PROGRESS_SAVE_INTERVAL or i == total:
+                pipeline.save_progress({
+                    'processed': i,
+                    'total': total,
+                    'successful': len(all_results),
+                    'failed': failed_count
+                }, args.output)
+                last_save = now
+            
+            logger.info(f"Finished {i}/{total}: {publisher['name']}")
+            
+            # Log progress
+            if i % 5 == 0:
+                elapsed = time.perf_counter() - start_time
+                rate = i / elapsed * 60  # publishers per minute
+                logger.info(f"Progress: {i}/{total} ({rate:.1f} publishers/min)")
     
     # Generate comparative reports
     if all_results:
         logger.info("Generating comparative analysis...")
-        generate_comparative_csv(all_results, args.output)
-        generate_summary_report(all_results, args.output)
+        # Both reports list publishers by sophistication; sort once for both
+        pipeline.sort_results(all_results)
+        pipeline.generate_comparative_csv(all_results, args.output, assume_sorted=True)
+        pipeline.generate_summary_report(all_results, args.output, assume_sorted=True)
     
     # Final summary
-    end_time = datetime.now()
-    duration = (end_time - start_time).total_seconds()
+    duration = time.perf_counter() - start_time
     
     logger.info("=" * 50)
     logger.info(f"Analysis complete!")
-    logger.info(f"Total publishers: {len(publishers)}")
+    logger.info(f"Total publishers: {total}")
     logger.info(f"Successful: {len(all_results)}")
     logger.info(f"Failed: {failed_count}")
     logger.info(f"Duration: {duration/60:.1f} minutes")
@@ -2,7 +2,7 @@
 """Simple test to verify Flask setup"""
 
 try:
-    from flask import Flask
+    from flask import Flask, Response
     print("✓ Flask is installed")
     
     # Test other imports
@@ -15,17 +15,9 @@ try:
     from utils.enhanced_scraper import scrape_page_enhanced
     print("✓ Enhanced scraper can be imported")
     
-    # Try to start a simple Flask app
-    app = Flask(__name__)
-    
-    @app.route('/')
-    def hello():
-        return '<h1>Flask is working! Navigate to <a href="/app">/app</a> for the main application.</h1>'
-    
-    @app.route('/app')
-    def main_app():
-        # Serve the main app HTML
-        return '''
+    # Static pages, encoded once instead of on every request
+    INDEX_HTML = b'<h1>Flask is working! Navigate to <a href="/app">/app</a> for the main application.</h1>'
+    APP_HTML = b'''
         <!DOCTYPE html>
         <html>
         <head>
@@ -45,6 +37,18 @@ try:
         </html>
         '''
     
+    # Try to start a simple Flask app
+    app = Flask(__name__)
+    
+    @app.route('/')
+    def hello():
+        return Response(INDEX_HTML, mimetype='text/html')
+    
+    @app.route('/app')
+    def main_app():
+        # Serve the main app HTML
+        return Response(APP_HTML, mimetype='text/html')
+    
     @app.route('/test')
     def test_scrape():
         from flask import request
@@ -54,10 +58,20 @@ try:
         return '<h1>No URL provided</h1><p><a href="/app">Back</a></p>'
     
     print("✓ Flask app created successfully")
-    print("\nStarting Flask server on http://localhost:5002")
+    
+    # Serve directly with werkzeug; none of app.run()'s dev-server extras are needed here
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 5002, app, threaded=True)
+    host, port = server.server_address[:2]
+    print(f"\nStarting Flask server on http://{host}:{port}")
     print("Press Ctrl+C to stop")
     
-    app.run(debug=False, port=5002, host='127.0.0.1')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
     
 except ImportError as e:
     print(f"✗ Import error: {e}")
@@ -3,19 +3,32 @@ Enhanced linguistic analysis engine for subscription pages.
 Now uses Claude AI for multilingual behavioral economics analysis.
 """
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from typing import Dict, List
 import logging
+import threading
 from datetime import datetime
+from types import MappingProxyType
 
-from utils.enhanced_pipeline import enhanced_pipeline
-from config.settings import settings
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Shared EnhancedAnalysisPipeline, imported on first use so the scoring
+# helpers below can be used without loading the Claude client
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def _get_pipeline():
+    """Return the shared analysis pipeline, importing it on first call."""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                from utils.enhanced_pipeline import enhanced_pipeline
+                _pipeline = enhanced_pipeline
+    return _pipeline
+
 
 def analyze_text(text: str, publisher_name: str, language: str = 'auto') -> Dict:
     """
@@ -29,23 +42,31 @@ def analyze_text(text: str, publisher_name: str, language: str = 'auto') -> Dict
     Returns:
         Dictionary containing all analysis results
     """
-    logger.info(f"Starting Claude-powered analysis for {publisher_name} (language: {language})")
+    logger.info("Starting Claude-powered analysis for %s (language: %s)", publisher_name, language)
     
     try:
         # Use enhanced pipeline for Claude analysis
-        results = enhanced_pipeline.analyze_text(text, publisher_name, language)
+        results = _get_pipeline().analyze_text(text, publisher_name, language)
         
         # Add any backward compatibility adjustments
         results = _ensure_backward_compatibility(results)
         
-        logger.info(f"Claude analysis completed for {publisher_name}")
+        logger.info("Claude analysis completed for %s", publisher_name)
         return results
         
     except Exception as e:
-        logger.error(f"Analysis failed for {publisher_name}: {str(e)}")
+        logger.error("Analysis failed for %s: %s", publisher_name, e)
         raise
 
 
+# Placeholder pricing section for results produced without pricing analysis
+_DEFAULT_PRICING_MENTIONS = MappingProxyType({
+    'count': 0,
+    'examples': (),
+    'note': 'Pricing analysis not performed in Claude mode'
+})
+
+
 def _ensure_backward_compatibility(results: Dict) -> Dict:
     """
     Ensure backward compatibility with existing code that expects certain fields.
@@ -57,24 +78,59 @@ def _ensure_backward_compatibility(results: Dict) -> Dict:
         Results with backward compatibility adjustments
     """
     # Ensure timestamp field exists (some code might expect 'timestamp' instead of 'analysis_timestamp')
-    if 'analysis_timestamp' in results and 'timestamp' not in results:
-        results['timestamp'] = results['analysis_timestamp']
+    if 'analysis_timestamp' in results:
+        results.setdefault('timestamp', results['analysis_timestamp'])
     
     # Ensure word_frequency exists (even if empty for Claude analysis)
-    if 'word_frequency' not in results:
-        results['word_frequency'] = {}
+    results.setdefault('word_frequency', {})
     
-    # Ensure pricing_mentions exists for compatibility
+    # Ensure pricing_mentions exists for compatibility; checked first so the
+    # default is only copied when it is actually needed
     if 'pricing_mentions' not in results:
-        results['pricing_mentions'] = {
-            'count': 0,
-            'examples': [],
-            'note': 'Pricing analysis not performed in Claude mode'
-        }
+        results['pricing_mentions'] = {**_DEFAULT_PRICING_MENTIONS, 'examples': []}
     
     return results
 
 
+# Fallback sophistication score inputs: (results key, component weight, (field, multiplier) pairs).
+# Each component is the mean of its weighted fields; the balance component carries weight 0.1.
+_SOPHISTICATION_COMPONENTS = (
+    ('motivation_framework', 0.3, (
+        ('support_ratio', 2),  # Favor support over transactional
+        ('mission_density', 100),
+        ('identity_score', 100),
+        ('community_score', 100),
+    )),
+    ('behavioral_triggers', 0.3, (
+        ('scarcity_score', 50),
+        ('social_proof_score', 100),
+        ('loss_aversion_score', 50),
+        ('reciprocity_score', 100),
+        ('authority_score', 75),  # New authority component
+    )),
+    ('habit_formation', 0.2, (
+        ('temporal_score', 100),
+        ('frequency_score', 100),
+        ('convenience_score', 100),
+        ('platform_score', 100),
+    )),
+    ('emotional_appeals', 0.1, (
+        ('fear_score', 50),
+        ('hope_score', 75),
+        ('belonging_score', 100),
+        ('status_score', 75),
+    )),
+)
+_BALANCE_WEIGHT = 0.1
+
+# Multiplier x component weight / component size, flattened in field order
+_SOPHISTICATION_COEFFICIENTS = tuple(
+    float(multiplier) * weight / len(fields)
+    for _, weight, fields in _SOPHISTICATION_COMPONENTS
+    for _, multiplier in fields
+)
+
+
 def calculate_sophistication_score(results: Dict) -> float:
     """
     Calculate overall sophistication score based on various metrics.
@@ -94,72 +150,41 @@ def calculate_sophistication_score(results: Dict) -> float:
     # Fallback calculation (should not be needed with Claude analysis)
     logger.warning("Using fallback sophistication score calculation")
     
-    # Weights for different components
-    weights = {
-        'motivation': 0.3,
-        'behavioral': 0.3,
-        'habit': 0.2,
-        'emotional': 0.1,
-        'balance': 0.1
-    }
-    
-    # Motivation component
-    mot = results.get('motivation_framework', {})
-    motivation_score = (
-        mot.get('support_ratio', 0) * 2 +  # Favor support over transactional
-        mot.get('mission_density', 0) * 100 +
-        mot.get('identity_score', 0) * 100 +
-        mot.get('community_score', 0) * 100
-    ) / 4
-    
-    # Behavioral component
-    beh = results.get('behavioral_triggers', {})
-    behavioral_score = (
-        beh.get('scarcity_score', 0) * 50 +
-        beh.get('social_proof_score', 0) * 100 +
-        beh.get('loss_aversion_score', 0) * 50 +
-        beh.get('reciprocity_score', 0) * 100 +
-        beh.get('authority_score', 0) * 75  # New authority component
-    ) / 5
-    
-    # Habit component
-    hab = results.get('habit_formation', {})
-    habit_score = (
-        hab.get('temporal_score', 0) * 100 +
-        hab.get('frequency_score', 0) * 100 +
-        hab.get('convenience_score', 0) * 100 +
-        hab.get('platform_score', 0) * 100
-    ) / 4
-    
-    # Emotional component (new)
-    emo = results.get('emotional_appeals', {})
-    emotional_score = (
-        emo.get('fear_score', 0) * 50 +
-        emo.get('hope_score', 0) * 75 +
-        emo.get('belonging_score', 0) * 100 +
-        emo.get('status_score', 0) * 75
-    ) / 4
-    
-    # Balance component (diversity of approaches)
+    # Extract every input once into a flat vector matching _SOPHISTICATION_COEFFICIENTS
+    values = []
     non_zero_scores = 0
-    for category in [mot, beh, hab, emo]:
-        for score_name, score in category.items():
+    for category, _, fields in _SOPHISTICATION_COMPONENTS:
+        data = results.get(category, {})
+        values.extend(float(data.get(field, 0)) for field, _ in fields)
+        
+        # Balance component (diversity of approaches)
+        for score_name, score in data.items():
             if score_name.endswith('_score') and score > 0:
                 non_zero_scores += 1
     
     balance_score = min(non_zero_scores / 16 * 10, 10)  # 16 total score types now
     
-    # Calculate weighted total
-    total = (
-        motivation_score * weights['motivation'] +
-        behavioral_score * weights['behavioral'] +
-        habit_score * weights['habit'] +
-        emotional_score * weights['emotional'] +
-        balance_score * weights['balance']
+    total = balance_score * _BALANCE_WEIGHT + sum(
+        value * coefficient for value, coefficient in zip(values, _SOPHISTICATION_COEFFICIENTS)
     )
-    
-    # Normalize to 0-10 scale
-    return min(max(total, 0), 10)
+    return min(max(total, 0.0), 10.0)
+
+
+# Fallback strategy classification inputs
+_STRATEGY_MOTIVATION_KEYS = ('mission_density', 'community_score', 'support_ratio', 'feature_density')
+_STRATEGY_BEHAVIORAL_KEYS = ('scarcity_score', 'social_proof_score', 'loss_aversion_score', 'authority_score')
+
+# Behavioral strength above which each orientation counts as sophisticated
+_STRATEGY_THRESHOLDS = {
+    'mission-driven': 0.01,
+    'feature-driven': 0.01,
+    'hybrid': 0.02,
+}
+# (basic, sophisticated) label per orientation, indexed by the threshold test
+_STRATEGY_LABELS = {
+    orientation: (f"{orientation}-basic", f"{orientation}-sophisticated")
+    for orientation in _STRATEGY_THRESHOLDS
+}
 
 
 def classify_strategy(results: Dict) -> str:
@@ -180,40 +205,41 @@ def classify_strategy(results: Dict) -> str:
     logger.warning("Using fallback strategy classification")
     
     mot = results.get('motivation_framework', {})
+    mission_density, community_score, support_ratio, feature_density = (
+        mot.get(key, 0) for key in _STRATEGY_MOTIVATION_KEYS
+    )
     
     # Calculate strategy indicators
-    mission_strength = (
-        mot.get('mission_density', 0) + 
-        mot.get('community_score', 0) + 
-        mot.get('support_ratio', 0)
-    )
-    feature_strength = mot.get('feature_density', 0) + (1 - mot.get('support_ratio', 0))
+    mission_strength = mission_density + community_score + support_ratio
+    feature_strength = feature_density + (1 - support_ratio)
     
     # Check for behavioral triggers
     beh = results.get('behavioral_triggers', {})
-    behavioral_strength = sum([
-        beh.get('scarcity_score', 0),
-        beh.get('social_proof_score', 0),
-        beh.get('loss_aversion_score', 0),
-        beh.get('authority_score', 0)
-    ])
+    behavioral_strength = sum(beh.get(key, 0) for key in _STRATEGY_BEHAVIORAL_KEYS)
     
     # Classify
     if mission_strength > feature_strength * 1.5:
-        if behavioral_strength > 0.01:
-            return "mission-driven-sophisticated"
-        else:
-            return "mission-driven-basic"
+        orientation = 'mission-driven'
     elif feature_strength > mission_strength * 1.5:
-        if behavioral_strength > 0.01:
-            return "feature-driven-sophisticated"
-        else:
-            return "feature-driven-basic"
+        orientation = 'feature-driven'
     else:
-        if behavioral_strength > 0.02:
-            return "hybrid-sophisticated"
-        else:
-            return "hybrid-basic"
+        orientation = 'hybrid'
+    
+    basic_label, sophisticated_label = _STRATEGY_LABELS[orientation]
+    return sophisticated_label if behavioral_strength > _STRATEGY_THRESHOLDS[orientation] else basic_label
+
+
+# Fallback innovation rules: an indicator fires when its input exceeds the threshold
+_INNOVATION_RULES = (
+    (0.02, "Strong community emphasis"),             # community_score
+    (5, "Extensive social proof usage"),             # social proof count
+    (10, "Strong habit formation strategy"),         # total habit counts
+    (0.01, "Reciprocity-based messaging"),           # reciprocity_score
+    (0.01, "Multi-platform accessibility focus"),    # platform_score
+    (0.01, "Strong belonging and identity appeals"), # belonging_score
+)
+_INNOVATION_THRESHOLDS = np.array([threshold for threshold, _ in _INNOVATION_RULES], dtype=np.float64)
+_INNOVATION_MESSAGES = tuple(message for _, message in _INNOVATION_RULES)
 
 
 def get_innovation_indicators(results: Dict) -> List[str]:
@@ -231,38 +257,23 @@ def get_innovation_indicators(results: Dict) -> List[str]:
         return results['key_insights']
     
     # Fallback innovation detection
-    innovations = []
-    
     mot = results.get('motivation_framework', {})
     beh = results.get('behavioral_triggers', {})
     hab = results.get('habit_formation', {})
     emo = results.get('emotional_appeals', {})
     cultural = results.get('cultural_adaptations', {})
     
-    # Check for high community focus
-    if mot.get('community_score', 0) > 0.02:
-        innovations.append("Strong community emphasis")
-    
-    # Check for sophisticated social proof
-    if beh.get('counts', {}).get('social_proof', 0) > 5:
-        innovations.append("Extensive social proof usage")
-    
-    # Check for habit formation focus
-    habit_total = sum(hab.get('counts', {}).values())
-    if habit_total > 10:
-        innovations.append("Strong habit formation strategy")
-    
-    # Check for reciprocity emphasis
-    if beh.get('reciprocity_score', 0) > 0.01:
-        innovations.append("Reciprocity-based messaging")
-    
-    # Check for multi-platform emphasis
-    if hab.get('platform_score', 0) > 0.01:
-        innovations.append("Multi-platform accessibility focus")
-    
-    # Check for emotional sophistication
-    if emo.get('belonging_score', 0) > 0.01:
-        innovations.append("Strong belonging and identity appeals")
+    # Gather every rule input in _INNOVATION_MESSAGES order and compare in one step
+    scores = np.fromiter((
+        mot.get('community_score', 0),
+        beh.get('counts', {}).get('social_proof', 0),
+        sum(hab.get('counts', {}).values()),
+        beh.get('reciprocity_score', 0),
+        hab.get('platform_score', 0),
+        emo.get('belonging_score', 0),
+    ), dtype=np.float64, count=len(_INNOVATION_MESSAGES))
+    mask = scores > _INNOVATION_THRESHOLDS
+    innovations = [message for message, hit in zip(_INNOVATION_MESSAGES, mask) if hit]
     
     # Check for cultural adaptations
     if cultural.get('cultural_elements'):
@@ -278,7 +289,7 @@ def get_supported_languages() -> Dict[str, str]:
     Returns:
         Dictionary mapping language codes to names
     """
-    return enhanced_pipeline.get_supported_languages()
+    return _get_pipeline().get_supported_languages()
 
 
 def clear_analysis_cache(max_age_hours: int = None):
@@ -288,7 +299,7 @@ def clear_analysis_cache(max_age_hours: int = None):
     Args:
         max_age_hours: Maximum age in hours (use settings default if None)
     """
-    return enhanced_pipeline.clear_cache(max_age_hours)
+    return _get_pipeline().clear_cache(max_age_hours)
 
 
 # Maintain backward compatibility for direct function imports
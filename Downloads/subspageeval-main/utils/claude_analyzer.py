@@ -3,23 +3,368 @@ Claude AI-powered analyzer for subscription page linguistic analysis.
 Supports multilingual analysis across 17 European languages.
 """
 
-import json
 import hashlib
+import importlib.util
 import logging
 import asyncio
+import re
+import sqlite3
+import threading
 import time
-from pathlib import Path
-from typing import Dict, Optional, Tuple
-from datetime import datetime, timedelta
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+from functools import lru_cache, partial
+from types import MappingProxyType
 
 import anthropic
-from langdetect import detect
+import httpx
+from langdetect import DetectorFactory, PROFILES_DIRECTORY
 from langdetect.lang_detect_exception import LangDetectException as LangDetectError
 
-from config.settings import settings
+try:
+    import fasttext
+except ImportError:
+    fasttext = None
+
+try:
+    from blake3 import blake3 as _cache_hasher
+except ImportError:
+    # Same 32-byte digest as BLAKE3 so cache file names keep one shape
+    _cache_hasher = partial(hashlib.blake2b, digest_size=32)
+
+from config.settings import get_language_name, settings
+from utils import json_utils
 
 logger = logging.getLogger(__name__)
 
+# Analysis cache database, stored in settings.CACHE_DIR
+CACHE_DB_NAME = 'cache.sqlite'
+# Serialized analyses kept in memory in front of the database, evicted oldest first
+ANALYSIS_MEMO_SIZE = 512
+
+# HTTP/2 lets concurrent requests share one connection; httpx needs the h2 package for it
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+# Keep-alive pool shared by every request a client makes
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+
+def _http_client_options() -> Dict:
+    """Keyword arguments for the httpx clients behind the Anthropic clients."""
+    return {
+        'http2': HTTP2_AVAILABLE,
+        'limits': HTTP_LIMITS,
+        'timeout': httpx.Timeout(settings.REQUEST_TIMEOUT_SECONDS, connect=10.0)
+    }
+
+
+# Opt in to prompt caching for the shared analysis instructions
+PROMPT_CACHING_HEADERS = {'anthropic-beta': 'prompt-caching-2024-07-31'}
+
+# Regional languages langdetect reports that we analyze as their majority language
+_LANGUAGE_ALIASES = {
+    'ca': 'es',  # Catalan -> Spanish
+    'gl': 'es',  # Galician -> Spanish
+    'eu': 'es',  # Basque -> Spanish
+}
+
+_detector_factory = None
+_detector_factory_lock = threading.Lock()
+
+
+def _get_detector_factory() -> DetectorFactory:
+    """
+    Return the shared langdetect factory, loading its profiles on first use.
+    
+    langdetect's own detect() lazily builds a global factory without locking
+    and with a random seed; this one is built once under a lock and seeded so
+    the same text always gets the same answer. Every profile is loaded, so
+    unsupported languages are recognised as such rather than mistaken for the
+    closest supported one.
+    
+    Returns:
+        DetectorFactory with language profiles loaded
+    """
+    global _detector_factory
+    if _detector_factory is None:
+        with _detector_factory_lock:
+            if _detector_factory is None:
+                factory = DetectorFactory()
+                factory.load_profile(PROFILES_DIRECTORY)
+                factory.set_seed(0)
+                _detector_factory = factory
+    return _detector_factory
+
+
+# Characters sampled for detection, and the prefix tried first
+DETECTION_WINDOW = 1000
+DETECTION_PREFIX = 256
+# Top-language probability at which the prefix alone is trusted
+DETECTION_EARLY_EXIT_PROB = 0.99
+
+# Detected languages remembered per analyzer
+LANGUAGE_CACHE_SIZE = 10_000
+
+_NON_SPACE_RE = re.compile(r'\S')
+
+
+def _detect_with_langdetect(text: str) -> str:
+    """
+    Detect a language with fresh Detectors from the shared factory.
+    
+    A short prefix is scored first and returned when langdetect is already
+    confident; otherwise the whole window is scored.
+    """
+    factory = _get_detector_factory()
+    
+    if len(text) > DETECTION_PREFIX:
+        # Cut at a space so the prefix does not end mid-word
+        cut = text.rfind(' ', 0, DETECTION_PREFIX)
+        detector = factory.create()
+        detector.append(text[:cut if cut > 0 else DETECTION_PREFIX])
+        try:
+            best = detector.get_probabilities()[0]
+            if best.prob > DETECTION_EARLY_EXIT_PROB:
+                return best.lang
+        except (LangDetectError, IndexError):
+            pass
+    
+    # Detectors cache their scores after the first query, so score the
+    # full window with a new one
+    detector = factory.create()
+    detector.append(text)
+    return detector.detect()
+
+
+_lid_model = None
+_lid_model_loaded = False
+_lid_model_lock = threading.Lock()
+
+
+def _get_lid_model():
+    """
+    Load the fastText language-identification model on first use.
+    
+    Returns:
+        fastText model, or None if fasttext or the model file is unavailable
+    """
+    global _lid_model, _lid_model_loaded
+    if not _lid_model_loaded:
+        with _lid_model_lock:
+            if not _lid_model_loaded:
+                model_path = settings.LID_MODEL_PATH
+                if fasttext is not None and model_path:
+                    try:
+                        _lid_model = fasttext.load_model(model_path)
+                        logger.info(f"Loaded fastText language model from {model_path}")
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Could not load fastText language model: {e}")
+                _lid_model_loaded = True
+    return _lid_model
+
+
+# Cultural context for different language families
+_CULTURAL_CONTEXTS = MappingProxyType({
+    'de': "Pay attention to German directness, engineering precision references, and Ordnung (order) concepts.",
+    'fr': "Look for French formality, intellectual appeals, and cultural sophistication references.",
+    'es': "Notice Spanish community emphasis, family values, and relationship-building language.",
+    'pt': "Look for Portuguese warmth, personal connection, and community-focused messaging.",
+    'nl': "Pay attention to Dutch pragmatism, consensus-building, and egalitarian values.",
+    'sv': "Notice Swedish minimalism, environmental consciousness, and collective welfare themes.",
+    'da': "Look for Danish hygge concepts, work-life balance, and trust-based society references.",
+    'no': "Pay attention to Norwegian nature connections, egalitarian values, and quality of life themes.",
+    'fi': "Notice Finnish practicality, education values, and reserved but trustworthy communication.",
+    'pl': "Look for Polish tradition respect, community solidarity, and historical awareness.",
+    'cs': "Pay attention to Czech skepticism, intellectual heritage, and European identity themes.",
+    'sk': "Notice Slovak community focus, cultural preservation, and regional identity elements.",
+    'hu': "Look for Hungarian uniqueness emphasis, cultural pride, and intellectual tradition.",
+    'ro': "Pay attention to Romanian family values, cultural richness, and European integration themes.",
+    'lt': "Notice Lithuanian independence values, cultural resilience, and Baltic identity.",
+    'lv': "Look for Latvian cultural preservation, nature connection, and independence themes."
+})
+
+
+_DEFAULT_CULTURAL_CONTEXT = "Analyze using general European cultural contexts."
+
+# Every language's cultural notes, sent with the cached instructions so a
+# page's own prompt only has to name its language
+_CULTURAL_CONTEXT_GUIDE = '\n'.join([
+    "CULTURAL CONTEXT BY LANGUAGE:",
+    *(f"- {get_language_name(code)} ({code}): {context}" for code, context in _CULTURAL_CONTEXTS.items()),
+    f"- Any other language: {_DEFAULT_CULTURAL_CONTEXT}"
+])
+
+
+@lru_cache(maxsize=32)
+def _cultural_context(language: str) -> str:
+    """Cultural context prompt line for a language."""
+    return _CULTURAL_CONTEXTS.get(language, _DEFAULT_CULTURAL_CONTEXT)
+
+
+@lru_cache(maxsize=256)
+def _prompt_header(publisher_name: str, language: str) -> str:
+    """Page prompt up to the text itself; depends only on publisher and language."""
+    language_name = settings.get_language_name(language)
+    return (
+        f"Analyze this subscription page text from {publisher_name}.\n"
+        f"\n"
+        f"The text is in {language_name} ({language}). Apply the cultural context given for it above.\n"
+        f"Focus on culture-specific persuasion techniques for {language_name}.\n"
+        f"\n"
+        f"TEXT TO ANALYZE:\n"
+    )
+
+
+_PROMPT_FOOTER = "\n\nReturn ONLY the JSON object, no additional text or explanation."
+
+# Rough characters-per-token ratio used to budget page text without a tokenizer
+CHARS_PER_TOKEN = 4
+# Share of a truncated page's budget kept for pricing past the cut
+_PRICE_CONTEXT_SHARE = 8
+# Characters kept on either side of each price found past the cut
+_PRICE_CONTEXT_CHARS = 120
+# Amounts of money: currency symbols on either side of the number, or the
+# currency words and codes written after it in the supported markets
+# (e.g. "199 Kč", "29 zł", "990 Ft", "49 lei", "99 kr", "149,- Kč")
+_PRICE_RE = re.compile(
+    r'[$£€]\s?\d'
+    r'|\d(?:[.,]-+)?\s?(?:[$£€]|(?:kč|zł|ft|lei|kr|kn|chf|eur|usd|czk|pln|huf|ron|sek|nok|dkk)(?!\w))',
+    re.IGNORECASE
+)
+
+
+def _head_cut(text: str, limit: int) -> int:
+    """
+    Find where to end the kept head of a page, at most limit characters in.
+    
+    Cleaned text has no newlines, so a sentence end is preferred, then a space.
+    
+    Args:
+        text: Page text
+        limit: Maximum head length
+        
+    Returns:
+        Length of the head to keep
+    """
+    for boundary in ('\n', '. ', ' '):
+        cut = text.rfind(boundary, 0, limit)
+        if cut > limit // 2:
+            return cut + 1 if boundary == '. ' else cut
+    return limit
+
+
+def _price_snippets(text: str, start: int, budget: int) -> List[str]:
+    """
+    Collect the text around each price mentioned from start onwards.
+    
+    Args:
+        text: Page text
+        start: Offset the search starts at
+        budget: Maximum characters of snippets to return
+        
+    Returns:
+        Snippets in page order, each trimmed to whole words
+    """
+    snippets = []
+    covered = start
+    for match in _PRICE_RE.finditer(text, start):
+        if match.start() < covered:
+            # Already inside the previous snippet
+            continue
+        
+        begin = max(covered, match.start() - _PRICE_CONTEXT_CHARS)
+        end = min(len(text), match.end() + _PRICE_CONTEXT_CHARS)
+        if begin > covered:
+            space = text.find(' ', begin, match.start())
+            if space != -1:
+                begin = space + 1
+        if end < len(text):
+            space = text.rfind(' ', match.end(), end)
+            if space != -1:
+                end = space
+        
+        snippet = text[begin:end].strip()
+        budget -= len(snippet) + 1
+        if budget < 0:
+            break
+        snippets.append(snippet)
+        covered = end
+    return snippets
+
+
+def _truncate_text(text: str, max_tokens: int) -> str:
+    """
+    Cap page text at roughly max_tokens tokens.
+    
+    The head of the page is kept, followed by the text around any later
+    prices, so pricing further down the page survives the cut.
+    
+    Args:
+        text: Page text
+        max_tokens: Approximate token budget
+        
+    Returns:
+        The text unchanged if it fits, otherwise the truncated text
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    
+    price_budget = max_chars // _PRICE_CONTEXT_SHARE
+    cut = _head_cut(text, max_chars - price_budget)
+    price_snippets = _price_snippets(text, cut, price_budget)
+    
+    logger.info(f"Truncated page text from {len(text)} to about {max_chars} characters")
+    return '\n'.join([text[:cut].rstrip(), '[...]', *price_snippets])
+
+
+# Output tokens requested for a single page analysis
+ANALYSIS_MAX_TOKENS = 4000
+# Characters of per-page prompt text around the page itself (header, context, footer)
+_PAGE_PROMPT_OVERHEAD_CHARS = 600
+# Window the token-per-minute budget is measured over
+_TOKEN_WINDOW_SECONDS = 60.0
+
+# Limits for analyze_combined. Every page's analysis shares one response,
+# so the model's output token cap bounds how many pages fit in a request
+COMBINED_MAX_PAGES = 4
+COMBINED_MAX_INPUT_TOKENS = 80_000
+# Output tokens budgeted per page in a combined response, example quotes included
+COMBINED_PAGE_OUTPUT_TOKENS = 3000
+# Output token cap per model; Claude 3 models stop at DEFAULT_MAX_OUTPUT_TOKENS,
+# which leaves room for a single page, so combining only happens on larger caps
+_MODEL_MAX_OUTPUT_TOKENS = MappingProxyType({
+    'claude-3-5-sonnet-20241022': 8192,
+    'claude-3-5-haiku-20241022': 8192,
+})
+DEFAULT_MAX_OUTPUT_TOKENS = 4096
+
+
+def _max_output_tokens() -> int:
+    """Output token cap of the configured model."""
+    return _MODEL_MAX_OUTPUT_TOKENS.get(settings.CLAUDE_MODEL, DEFAULT_MAX_OUTPUT_TOKENS)
+
+
+def _combined_page_limit(max_pages: int) -> int:
+    """
+    Pages whose analyses fit together in one response of the configured model.
+    
+    Args:
+        max_pages: Requested maximum pages per request
+        
+    Returns:
+        Pages per combined request, at least 1
+    """
+    return max(1, min(max_pages, _max_output_tokens() // COMBINED_PAGE_OUTPUT_TOKENS))
+
+_COMBINED_INSTRUCTIONS = """
+The pages to analyze follow as a JSON array of objects with "id", "publisher", "language" and "text" fields. Analyze each page independently, applying the cultural context given above for its language, and return ONLY a JSON object of the form:
+
+{"results": [{"id": 0, "analysis": { ...the structure above... }}, ...]}
+
+Include exactly one entry per page id. Keep example quotes short.
+""".strip()
+
 
 class ClaudeAnalyzer:
     """
@@ -27,15 +372,143 @@ class ClaudeAnalyzer:
     Supports behavioral economics analysis in multiple languages.
     """
     
+    # Instructions shared by every analysis request, cultural notes included.
+    # Kept byte-for-byte stable and sent first so Anthropic's prompt cache can
+    # reuse them across calls; caching needs a prefix of at least 1024 tokens.
+    ANALYSIS_INSTRUCTIONS = """
+You are an expert in behavioral economics and multilingual marketing analysis. You will be given the text of a subscription page, its publisher and its language.
+
+Analyze the text for behavioral economics principles and return ONLY a valid JSON object with this exact structure:
+
+{
+    "motivation_framework": {
+        "support_ratio": 0.0,
+        "mission_density": 0.0,
+        "feature_density": 0.0,
+        "identity_score": 0.0,
+        "community_score": 0.0,
+        "counts": {
+            "support": 0,
+            "transactional": 0,
+            "mission": 0,
+            "feature": 0,
+            "identity": 0,
+            "community": 0
+        },
+        "examples": {
+            "support": ["example quotes"],
+            "transactional": ["example quotes"],
+            "mission": ["example quotes"],
+            "feature": ["example quotes"],
+            "identity": ["example quotes"],
+            "community": ["example quotes"]
+        }
+    },
+    "behavioral_triggers": {
+        "scarcity_score": 0.0,
+        "social_proof_score": 0.0,
+        "loss_aversion_score": 0.0,
+        "reciprocity_score": 0.0,
+        "authority_score": 0.0,
+        "counts": {
+            "scarcity": 0,
+            "social_proof": 0,
+            "loss_aversion": 0,
+            "reciprocity": 0,
+            "authority": 0
+        },
+        "examples": {
+            "scarcity": ["example quotes"],
+            "social_proof": ["example quotes"],
+            "loss_aversion": ["example quotes"],
+            "reciprocity": ["example quotes"],
+            "authority": ["example quotes"]
+        }
+    },
+    "habit_formation": {
+        "temporal_score": 0.0,
+        "frequency_score": 0.0,
+        "convenience_score": 0.0,
+        "platform_score": 0.0,
+        "counts": {
+            "temporal": 0,
+            "frequency": 0,
+            "convenience": 0,
+            "platform": 0
+        },
+        "examples": {
+            "temporal": ["example quotes"],
+            "frequency": ["example quotes"],
+            "convenience": ["example quotes"],
+            "platform": ["example quotes"]
+        }
+    },
+    "emotional_appeals": {
+        "fear_score": 0.0,
+        "hope_score": 0.0,
+        "belonging_score": 0.0,
+        "status_score": 0.0,
+        "examples": {
+            "fear": ["example quotes"],
+            "hope": ["example quotes"],
+            "belonging": ["example quotes"],
+            "status": ["example quotes"]
+        }
+    },
+    "cultural_adaptations": {
+        "cultural_elements": ["list of culture-specific elements"],
+        "local_references": ["local cultural references"],
+        "communication_style": "direct/indirect/formal/informal",
+        "trust_building": ["trust-building elements specific to this culture"]
+    },
+    "total_words": 0,
+    "sophistication_score": 0.0,
+    "primary_strategy": "mission-driven/feature-driven/hybrid",
+    "key_insights": ["3-5 key insights about the strategy"]
+}
+
+SCORING GUIDELINES:
+- All scores should be between 0.0 and 1.0
+- support_ratio: Ratio of support language vs transactional language
+- Density scores: Count of relevant terms / total words
+- Sophistication score: Overall marketing sophistication (0-10 scale, but return as 0.0-1.0)
+- Include actual quotes from the text in examples arrays
+- Provide counts of relevant terms found
+""".strip() + '\n\n' + _CULTURAL_CONTEXT_GUIDE
+    
     def __init__(self):
         """Initialize the Claude analyzer with API client."""
-        self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+        self.client = anthropic.Anthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            default_headers=PROMPT_CACHING_HEADERS,
+            http_client=httpx.Client(**_http_client_options())
+        )
+        
+        # Async client for batch analysis, created per event loop on first use
+        self._async_client = None
+        self._async_client_loop = None
+        
         self.cache_dir = settings.CACHE_DIR
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # One SQLite store for all cached analyses; the connection is shared
+        # across worker threads, so statements are serialized by the lock
+        self.cache_db = self._open_cache_db()
+        self._cache_db_lock = threading.Lock()
+        # Recent cache entries as (timestamp, blob), guarded by the same lock
+        self._analysis_memo: Dict[str, Tuple[float, bytes]] = {}
+        
         # Rate limiting
-        self.last_request_time = 0
+        self.last_request_time = float('-inf')
         self.min_request_interval = 60 / settings.API_RATE_LIMIT_PER_MINUTE
+        self._rate_limit_lock = threading.Lock()
+        # Token estimates of requests in the last minute, as (send time, tokens)
+        self._token_window = deque()
+        self._token_window_total = 0
+        
+        # Detected language per page prefix digest, evicted oldest first
+        self._lang_cache: Dict[bytes, str] = {}
+        self._lang_cache_lock = threading.Lock()
         
         logger.info(f"Claude analyzer initialized with model: {settings.CLAUDE_MODEL}")
     
@@ -53,12 +526,166 @@ class ClaudeAnalyzer:
         """
         logger.info(f"Starting Claude analysis for {publisher_name} (language: {language})")
         
+        cached_result, language = self._prepare_analysis(text, publisher_name, language)
+        if cached_result:
+            return cached_result
+        
+        # Rate limiting
+        self._handle_rate_limiting(self._estimate_request_tokens(self._prompt_text_chars(text)))
+        
+        try:
+            # Get analysis from Claude
+            analysis_result = self._call_claude_api(text, publisher_name, language)
+            return self._finish_analysis(text, publisher_name, language, analysis_result)
+            
+        except Exception as e:
+            logger.error(f"Claude analysis failed for {publisher_name}: {str(e)}")
+            raise
+    
+    async def analyze_subscription_page_async(self, text: str, publisher_name: str, language: str = 'auto') -> Dict:
+        """
+        Analyze subscription page text using the async Claude client.
+        
+        Args:
+            text: Text content from subscription page
+            publisher_name: Name of the publisher
+            language: Language code (auto-detect if 'auto')
+            
+        Returns:
+            Dict containing comprehensive analysis results
+        """
+        logger.info(f"Starting Claude analysis for {publisher_name} (language: {language})")
+        
+        cached_result, language = self._prepare_analysis(text, publisher_name, language)
+        if cached_result:
+            return cached_result
+        
+        await self._handle_rate_limiting_async(self._estimate_request_tokens(self._prompt_text_chars(text)))
+        
+        try:
+            analysis_result = await self._call_claude_api_async(text, publisher_name, language)
+            return self._finish_analysis(text, publisher_name, language, analysis_result)
+            
+        except Exception as e:
+            logger.error(f"Claude analysis failed for {publisher_name}: {str(e)}")
+            raise
+    
+    async def analyze_batch(self, items: Iterable[Tuple[str, str, str]],
+                            max_concurrency: Optional[int] = None) -> List:
+        """
+        Analyze several pages concurrently.
+        
+        Requests are issued in parallel up to max_concurrency and paced by the
+        shared rate limiter, so wall time approaches the slowest call rather
+        than the sum of all calls.
+        
+        Args:
+            items: (text, publisher_name, language) tuples
+            max_concurrency: Maximum in-flight requests (defaults to MAX_CONCURRENT_ANALYSES)
+            
+        Returns:
+            Results in input order; a failed analysis yields its exception
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.MAX_CONCURRENT_ANALYSES)
+        
+        async def analyze_one(item):
+            async with semaphore:
+                return await self.analyze_subscription_page_async(*item)
+        
+        return await asyncio.gather(*(analyze_one(item) for item in items), return_exceptions=True)
+    
+    def analyze_combined(self, items: Iterable[Tuple[str, str, str]],
+                         max_pages: int = COMBINED_MAX_PAGES) -> List:
+        """
+        Analyze several pages with as few Claude requests as possible.
+        
+        Pages are grouped into requests of up to max_pages pages and
+        COMBINED_MAX_INPUT_TOKENS of text, cutting request count when the
+        API's requests-per-minute limit is the bottleneck. Groups are further
+        capped so every page's analysis fits in the model's output limit; on
+        models with a 4096-token cap each page gets its own request. Cached
+        pages are served from the cache, and any page missing from a combined
+        response is retried with its own request.
+        
+        Args:
+            items: (text, publisher_name, language) tuples
+            max_pages: Maximum pages per request
+            
+        Returns:
+            Results in input order; a failed analysis yields its exception
+        """
+        items = list(items)
+        results: List = [None] * len(items)
+        
+        # Resolve cache hits and languages up front
+        pending = []
+        for index, (text, publisher_name, language) in enumerate(items):
+            try:
+                cached_result, language = self._prepare_analysis(text, publisher_name, language)
+            except Exception as e:
+                results[index] = e
+                continue
+            if cached_result:
+                results[index] = cached_result
+            else:
+                pending.append((index, text, publisher_name, language))
+        
+        # Group pending pages by count and approximate input size
+        max_pages = _combined_page_limit(max_pages)
+        max_chars = COMBINED_MAX_INPUT_TOKENS * CHARS_PER_TOKEN
+        groups, group, group_chars = [], [], 0
+        for page in pending:
+            page_chars = self._prompt_text_chars(page[1])
+            if group and (len(group) >= max_pages or group_chars + page_chars > max_chars):
+                groups.append(group)
+                group, group_chars = [], 0
+            group.append(page)
+            group_chars += page_chars
+        if group:
+            groups.append(group)
+        
+        for group in groups:
+            analyses = {}
+            if len(group) > 1:
+                group_chars = sum(self._prompt_text_chars(page[1]) for page in group)
+                self._handle_rate_limiting(self._estimate_request_tokens(
+                    group_chars + len(_COMBINED_INSTRUCTIONS), len(group), _max_output_tokens()
+                ))
+                try:
+                    analyses = self._call_claude_api_combined(group)
+                except Exception as e:
+                    logger.warning(f"Combined analysis of {len(group)} pages failed, analyzing separately: {e}")
+            
+            for index, text, publisher_name, language in group:
+                analysis_result = analyses.get(str(index))
+                try:
+                    if isinstance(analysis_result, dict):
+                        results[index] = self._finish_analysis(text, publisher_name, language, analysis_result)
+                    else:
+                        results[index] = self.analyze_subscription_page(text, publisher_name, language)
+                except Exception as e:
+                    results[index] = e
+        
+        return results
+    
+    def _prepare_analysis(self, text: str, publisher_name: str, language: str) -> Tuple[Optional[Dict], str]:
+        """
+        Check the cache and resolve the analysis language.
+        
+        Args:
+            text: Text content from subscription page
+            publisher_name: Name of the publisher
+            language: Requested language code
+            
+        Returns:
+            Tuple of (cached result or None, language code to analyze in)
+        """
         # Check cache first
         if settings.CACHE_ANALYSES:
             cached_result = self._get_cached_analysis(text, publisher_name, language)
             if cached_result:
                 logger.info(f"Retrieved cached analysis for {publisher_name}")
-                return cached_result
+                return cached_result, language
         
         # Detect language if needed
         if language == 'auto':
@@ -69,33 +696,37 @@ class ClaudeAnalyzer:
             language = 'en'  # Fallback to English
             logger.warning(f"Unsupported language detected, falling back to English")
         
-        # Rate limiting
-        self._handle_rate_limiting()
+        return None, language
+    
+    def _finish_analysis(self, text: str, publisher_name: str, language: str, analysis_result: Dict) -> Dict:
+        """
+        Attach metadata to a fresh Claude result and cache it.
         
-        try:
-            # Get analysis from Claude
-            analysis_result = self._call_claude_api(text, publisher_name, language)
-            
-            # Add metadata
-            analysis_result.update({
-                'publisher_name': publisher_name,
-                'detected_language': language,
-                'language_name': settings.get_language_name(language),
-                'analysis_timestamp': datetime.now().isoformat(),
-                'analysis_method': 'claude_ai',
-                'claude_model': settings.CLAUDE_MODEL
-            })
-            
-            # Cache the results
-            if settings.CACHE_ANALYSES:
-                self._cache_analysis(text, publisher_name, language, analysis_result)
-            
-            logger.info(f"Completed Claude analysis for {publisher_name}")
-            return analysis_result
+        Args:
+            text: Text content from subscription page
+            publisher_name: Name of the publisher
+            language: Language code the analysis ran in
+            analysis_result: Parsed Claude response
             
-        except Exception as e:
-            logger.error(f"Claude analysis failed for {publisher_name}: {str(e)}")
-            raise
+        Returns:
+            Completed analysis results
+        """
+        # Add metadata
+        analysis_result.update({
+            'publisher_name': publisher_name,
+            'detected_language': language,
+            'language_name': settings.get_language_name(language),
+            'analysis_timestamp': datetime.now().isoformat(),
+            'analysis_method': 'claude_ai',
+            'claude_model': settings.CLAUDE_MODEL
+        })
+        
+        # Cache the results
+        if settings.CACHE_ANALYSES:
+            self._cache_analysis(text, publisher_name, language, analysis_result)
+        
+        logger.info(f"Completed Claude analysis for {publisher_name}")
+        return analysis_result
     
     def _detect_language(self, text: str) -> str:
         """
@@ -108,46 +739,169 @@ class ClaudeAnalyzer:
             Language code (ISO 639-1)
         """
         try:
-            # Clean text for better detection
-            clean_text = text.strip()[:1000]  # Use first 1000 chars for detection
+            # Skip leading whitespace without copying the whole page
+            match = _NON_SPACE_RE.search(text)
+            start = match.start() if match else len(text)
+            clean_text = text[start:start + DETECTION_WINDOW].rstrip()
             
             if len(clean_text) < 50:
                 logger.warning("Text too short for reliable language detection")
                 return 'en'
             
-            detected_lang = detect(clean_text)
+            # Re-analyzed pages skip detection entirely
+            key = _cache_hasher(clean_text.encode()).digest()[:16]
+            with self._lang_cache_lock:
+                cached_lang = self._lang_cache.get(key)
+            if cached_lang is not None:
+                return cached_lang
             
-            # Map some common variations
-            lang_mapping = {
-                'ca': 'es',  # Catalan -> Spanish
-                'gl': 'es',  # Galician -> Spanish
-                'eu': 'es',  # Basque -> Spanish
-            }
+            # Use the fastText model when it is confident, langdetect otherwise
+            detected_lang = self._detect_language_fast(clean_text) or _detect_with_langdetect(clean_text)
             
-            detected_lang = lang_mapping.get(detected_lang, detected_lang)
+            # Map some common variations
+            detected_lang = _LANGUAGE_ALIASES.get(detected_lang, detected_lang)
             
             if detected_lang in settings.SUPPORTED_LANGUAGES:
                 logger.info(f"Detected language: {detected_lang}")
-                return detected_lang
             else:
                 logger.warning(f"Detected unsupported language: {detected_lang}, using English")
-                return 'en'
+                detected_lang = 'en'
+            
+            with self._lang_cache_lock:
+                self._lang_cache[key] = detected_lang
+                if len(self._lang_cache) > LANGUAGE_CACHE_SIZE:
+                    del self._lang_cache[next(iter(self._lang_cache))]
+            return detected_lang
                 
         except LangDetectError as e:
             logger.warning(f"Language detection failed: {e}, using English")
             return 'en'
     
-    def _handle_rate_limiting(self):
-        """Handle API rate limiting."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+    def _detect_language_fast(self, text: str) -> Optional[str]:
+        """
+        Identify the language with the optional fastText model.
         
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            Language code, or None if the model is unavailable or not confident
+        """
+        model = _get_lid_model()
+        if model is None:
+            return None
+        
+        # fastText predicts one line at a time
+        labels, probabilities = model.predict(text.replace('\n', ' '), k=1)
+        if labels and probabilities[0] >= settings.LID_CONFIDENCE_THRESHOLD:
+            return labels[0].replace('__label__', '')
+        return None
+    
+    def _prompt_text_chars(self, text: str) -> int:
+        """Characters of a page's text that reach the prompt after truncation."""
+        return min(len(text), settings.MAX_INPUT_TOKENS * CHARS_PER_TOKEN)
+    
+    def _estimate_request_tokens(self, page_chars: int, pages: int = 1,
+                                 max_output: int = ANALYSIS_MAX_TOKENS) -> int:
+        """
+        Estimate the tokens a request will count against the per-minute budget.
+        
+        Args:
+            page_chars: Total characters of page text in the request
+            pages: Number of pages in the request
+            max_output: Requested output token limit
+            
+        Returns:
+            Approximate input tokens plus max_output
+        """
+        prompt_chars = len(self.ANALYSIS_INSTRUCTIONS) + pages * _PAGE_PROMPT_OVERHEAD_CHARS
+        return (prompt_chars + page_chars) // CHARS_PER_TOKEN + max_output
+    
+    def _reserve_request_slot(self, tokens: int = 0) -> float:
+        """
+        Claim the next request slot allowed by the rate limits.
+        
+        Requests are spaced to stay under API_RATE_LIMIT_PER_MINUTE and, when
+        API_TOKENS_PER_MINUTE is set, delayed until the tokens reserved in the
+        preceding minute leave room for this one.
+        
+        Args:
+            tokens: Estimated tokens the request will use
+            
+        Returns:
+            Seconds to wait before sending the request
+        """
+        # Slots are handed out under the lock, but callers wait outside it,
+        # so threads and coroutines sharing this analyzer are paced together
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            slot = max(now, self.last_request_time + self.min_request_interval)
+            
+            token_limit = settings.API_TOKENS_PER_MINUTE
+            if token_limit > 0:
+                window = self._token_window
+                # Slots never decrease, so the window is ordered by send time
+                while window and window[0][0] <= slot - _TOKEN_WINDOW_SECONDS:
+                    self._token_window_total -= window.popleft()[1]
+                # Wait for the oldest reservations to age out until this one fits
+                while window and self._token_window_total + tokens > token_limit:
+                    sent_at, sent_tokens = window.popleft()
+                    self._token_window_total -= sent_tokens
+                    slot = max(slot, sent_at + _TOKEN_WINDOW_SECONDS)
+                window.append((slot, tokens))
+                self._token_window_total += tokens
+            
+            self.last_request_time = slot
+        return slot - now
+    
+    def _handle_rate_limiting(self, tokens: int = 0):
+        """
+        Handle API rate limiting.
+        
+        Args:
+            tokens: Estimated tokens the request will use
+        """
+        sleep_time = self._reserve_request_slot(tokens)
+        if sleep_time > 0:
             logger.info(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
             time.sleep(sleep_time)
+    
+    async def _handle_rate_limiting_async(self, tokens: int = 0):
+        """
+        Handle API rate limiting without blocking the event loop.
         
-        self.last_request_time = time.time()
+        Args:
+            tokens: Estimated tokens the request will use
+        """
+        sleep_time = self._reserve_request_slot(tokens)
+        if sleep_time > 0:
+            logger.info(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
+            await asyncio.sleep(sleep_time)
+    
+    def _get_async_client(self) -> anthropic.AsyncAnthropic:
+        """
+        Return an async client bound to the running event loop.
+        
+        Callers that own the loop must call close_async_client before it
+        ends, so its connection pool is released with it.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = anthropic.AsyncAnthropic(
+                api_key=settings.ANTHROPIC_API_KEY,
+                default_headers=PROMPT_CACHING_HEADERS,
+                http_client=httpx.AsyncClient(**_http_client_options())
+            )
+            self._async_client_loop = loop
+        return self._async_client
+    
+    async def close_async_client(self):
+        """Close the async client and its connection pool, if one is open."""
+        client = self._async_client
+        self._async_client = None
+        self._async_client_loop = None
+        if client is not None:
+            await client.close()
     
     def _call_claude_api(self, text: str, publisher_name: str, language: str) -> Dict:
         """
@@ -161,46 +915,171 @@ class ClaudeAnalyzer:
         Returns:
             Analysis results dictionary
         """
-        prompt = self._build_analysis_prompt(text, publisher_name, language)
+        try:
+            response = self.client.messages.create(
+                **self._build_request(text, publisher_name, language)
+            )
+        except Exception as e:
+            logger.error(f"Claude API call failed: {e}")
+            raise
+        
+        return self._parse_analysis_response(response.content[0].text)
+    
+    async def _call_claude_api_async(self, text: str, publisher_name: str, language: str) -> Dict:
+        """
+        Make an async API call to Claude for text analysis.
+        
+        Args:
+            text: Text to analyze
+            publisher_name: Publisher name
+            language: Language code
+            
+        Returns:
+            Analysis results dictionary
+        """
+        try:
+            response = await self._get_async_client().messages.create(
+                **self._build_request(text, publisher_name, language)
+            )
+        except Exception as e:
+            logger.error(f"Claude API call failed: {e}")
+            raise
+        
+        return self._parse_analysis_response(response.content[0].text)
+    
+    def _call_claude_api_combined(self, pages: List[Tuple[int, str, str, str]]) -> Dict[int, Dict]:
+        """
+        Analyze several pages in one Claude request.
+        
+        Args:
+            pages: (id, text, publisher_name, language) tuples
+            
+        Returns:
+            Mapping of page id (as a string) to its analysis; pages Claude skipped are absent
+        """
+        page_list = [
+            {
+                'id': page_id,
+                'publisher': publisher_name,
+                'language': language,
+                'text': _truncate_text(text, settings.MAX_INPUT_TOKENS)
+            }
+            for page_id, text, publisher_name, language in pages
+        ]
         
         try:
             response = self.client.messages.create(
                 model=settings.CLAUDE_MODEL,
-                max_tokens=4000,
-                temperature=0.1,  # Low temperature for consistent analysis
+                max_tokens=_max_output_tokens(),
+                temperature=0.1,
                 messages=[{
                     "role": "user",
-                    "content": prompt
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": self.ANALYSIS_INSTRUCTIONS,
+                            "cache_control": {"type": "ephemeral"}
+                        },
+                        {
+                            "type": "text",
+                            "text": _COMBINED_INSTRUCTIONS,
+                            "cache_control": {"type": "ephemeral"}
+                        },
+                        {
+                            "type": "text",
+                            "text": json_utils.dumps(page_list, indent=False).decode('utf-8')
+                        }
+                    ]
                 }]
             )
+        except Exception as e:
+            logger.error(f"Claude API call failed: {e}")
+            raise
+        
+        parsed = self._parse_analysis_response(response.content[0].text)
+        analyses = {}
+        for entry in parsed.get('results', []):
+            if isinstance(entry, dict) and isinstance(entry.get('analysis'), dict):
+                # Ids are compared as strings in case Claude quotes them
+                analyses[str(entry.get('id'))] = entry['analysis']
+        return analyses
+    
+    def _build_request(self, text: str, publisher_name: str, language: str) -> Dict:
+        """
+        Build the keyword arguments for a messages.create call.
+        
+        Args:
+            text: Text to analyze
+            publisher_name: Publisher name
+            language: Language code
             
-            # Parse the JSON response
-            response_text = response.content[0].text
-            
-            # Extract JSON from response (handle cases where Claude adds explanatory text)
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
-            
-            if json_start == -1 or json_end == 0:
-                raise ValueError("No JSON found in Claude response")
-            
-            json_content = response_text[json_start:json_end]
-            analysis_result = json.loads(json_content)
+        Returns:
+            Request parameters
+        """
+        prompt = self._build_analysis_prompt(text, publisher_name, language)
+        return {
+            'model': settings.CLAUDE_MODEL,
+            'max_tokens': ANALYSIS_MAX_TOKENS,
+            'temperature': 0.1,  # Low temperature for consistent analysis
+            'messages': [{
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": self.ANALYSIS_INSTRUCTIONS,
+                        "cache_control": {"type": "ephemeral"}
+                    },
+                    {
+                        "type": "text",
+                        "text": prompt
+                    }
+                ]
+            }]
+        }
+    
+    def _parse_analysis_response(self, response_text: str) -> Dict:
+        """
+        Extract the JSON analysis from Claude's response text.
+        
+        Args:
+            response_text: Text of the first response content block
             
-            return analysis_result
+        Returns:
+            Analysis results dictionary
             
-        except json.JSONDecodeError as e:
+        Raises:
+            ValueError: If the response contains no valid JSON object
+        """
+        # Claude usually returns the bare object, which parses directly
+        try:
+            parsed = json_utils.loads(response_text)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict):
+            return parsed
+        
+        # Extract JSON from response (handle cases where Claude adds explanatory text)
+        json_start = response_text.find('{')
+        json_end = response_text.rfind('}') + 1
+        
+        if json_start == -1 or json_end == 0:
+            logger.error("No JSON found in Claude response")
+            raise ValueError("No JSON found in Claude response")
+        
+        json_content = response_text[json_start:json_end]
+        try:
+            return json_utils.loads(json_content)
+        except ValueError as e:
             logger.error(f"Failed to parse Claude response as JSON: {e}")
             logger.debug(f"Raw response: {response_text[:500]}...")
             raise ValueError(f"Invalid JSON response from Claude: {e}")
-        
-        except Exception as e:
-            logger.error(f"Claude API call failed: {e}")
-            raise
     
     def _build_analysis_prompt(self, text: str, publisher_name: str, language: str) -> str:
         """
-        Build the analysis prompt for Claude.
+        Build the page-specific part of the analysis prompt for Claude.
+        
+        The schema and scoring rules live in ANALYSIS_INSTRUCTIONS, which is
+        sent ahead of this part so it can be served from the prompt cache.
         
         Args:
             text: Text to analyze
@@ -210,121 +1089,8 @@ class ClaudeAnalyzer:
         Returns:
             Formatted prompt string
         """
-        language_name = settings.get_language_name(language)
-        
-        # Cultural context for different language families
-        cultural_context = self._get_cultural_context(language)
-        
-        prompt = f"""
-You are an expert in behavioral economics and multilingual marketing analysis. Analyze this subscription page text from {publisher_name}.
-
-The text is in {language_name} ({language}). {cultural_context}
-
-TEXT TO ANALYZE:
-{text}
-
-Analyze the text for behavioral economics principles and return ONLY a valid JSON object with this exact structure:
-
-{{
-    "motivation_framework": {{
-        "support_ratio": 0.0,
-        "mission_density": 0.0,
-        "feature_density": 0.0,
-        "identity_score": 0.0,
-        "community_score": 0.0,
-        "counts": {{
-            "support": 0,
-            "transactional": 0,
-            "mission": 0,
-            "feature": 0,
-            "identity": 0,
-            "community": 0
-        }},
-        "examples": {{
-            "support": ["example quotes"],
-            "transactional": ["example quotes"],
-            "mission": ["example quotes"],
-            "feature": ["example quotes"],
-            "identity": ["example quotes"],
-            "community": ["example quotes"]
-        }}
-    }},
-    "behavioral_triggers": {{
-        "scarcity_score": 0.0,
-        "social_proof_score": 0.0,
-        "loss_aversion_score": 0.0,
-        "reciprocity_score": 0.0,
-        "authority_score": 0.0,
-        "counts": {{
-            "scarcity": 0,
-            "social_proof": 0,
-            "loss_aversion": 0,
-            "reciprocity": 0,
-            "authority": 0
-        }},
-        "examples": {{
-            "scarcity": ["example quotes"],
-            "social_proof": ["example quotes"],
-            "loss_aversion": ["example quotes"],
-            "reciprocity": ["example quotes"],
-            "authority": ["example quotes"]
-        }}
-    }},
-    "habit_formation": {{
-        "temporal_score": 0.0,
-        "frequency_score": 0.0,
-        "convenience_score": 0.0,
-        "platform_score": 0.0,
-        "counts": {{
-            "temporal": 0,
-            "frequency": 0,
-            "convenience": 0,
-            "platform": 0
-        }},
-        "examples": {{
-            "temporal": ["example quotes"],
-            "frequency": ["example quotes"],
-            "convenience": ["example quotes"],
-            "platform": ["example quotes"]
-        }}
-    }},
-    "emotional_appeals": {{
-        "fear_score": 0.0,
-        "hope_score": 0.0,
-        "belonging_score": 0.0,
-        "status_score": 0.0,
-        "examples": {{
-            "fear": ["example quotes"],
-            "hope": ["example quotes"],
-            "belonging": ["example quotes"],
-            "status": ["example quotes"]
-        }}
-    }},
-    "cultural_adaptations": {{
-        "cultural_elements": ["list of culture-specific elements"],
-        "local_references": ["local cultural references"],
-        "communication_style": "direct/indirect/formal/informal",
-        "trust_building": ["trust-building elements specific to this culture"]
-    }},
-    "total_words": 0,
-    "sophistication_score": 0.0,
-    "primary_strategy": "mission-driven/feature-driven/hybrid",
-    "key_insights": ["3-5 key insights about the strategy"]
-}}
-
-SCORING GUIDELINES:
-- All scores should be between 0.0 and 1.0
-- support_ratio: Ratio of support language vs transactional language
-- Density scores: Count of relevant terms / total words
-- Sophistication score: Overall marketing sophistication (0-10 scale, but return as 0.0-1.0)
-- Include actual quotes from the text in examples arrays
-- Provide counts of relevant terms found
-- Focus on culture-specific persuasion techniques for {language_name}
-
-Return ONLY the JSON object, no additional text or explanation.
-"""
-        
-        return prompt.strip()
+        text = _truncate_text(text, settings.MAX_INPUT_TOKENS)
+        return f"{_prompt_header(publisher_name, language)}{text}{_PROMPT_FOOTER}"
     
     def _get_cultural_context(self, language: str) -> str:
         """
@@ -336,26 +1102,7 @@ Return ONLY the JSON object, no additional text or explanation.
         Returns:
             Cultural context string
         """
-        contexts = {
-            'de': "Pay attention to German directness, engineering precision references, and Ordnung (order) concepts.",
-            'fr': "Look for French formality, intellectual appeals, and cultural sophistication references.",
-            'es': "Notice Spanish community emphasis, family values, and relationship-building language.",
-            'pt': "Look for Portuguese warmth, personal connection, and community-focused messaging.",
-            'nl': "Pay attention to Dutch pragmatism, consensus-building, and egalitarian values.",
-            'sv': "Notice Swedish minimalism, environmental consciousness, and collective welfare themes.",
-            'da': "Look for Danish hygge concepts, work-life balance, and trust-based society references.",
-            'no': "Pay attention to Norwegian nature connections, egalitarian values, and quality of life themes.",
-            'fi': "Notice Finnish practicality, education values, and reserved but trustworthy communication.",
-            'pl': "Look for Polish tradition respect, community solidarity, and historical awareness.",
-            'cs': "Pay attention to Czech skepticism, intellectual heritage, and European identity themes.",
-            'sk': "Notice Slovak community focus, cultural preservation, and regional identity elements.",
-            'hu': "Look for Hungarian uniqueness emphasis, cultural pride, and intellectual tradition.",
-            'ro': "Pay attention to Romanian family values, cultural richness, and European integration themes.",
-            'lt': "Notice Lithuanian independence values, cultural resilience, and Baltic identity.",
-            'lv': "Look for Latvian cultural preservation, nature connection, and independence themes."
-        }
-        
-        return contexts.get(language, "Analyze using general European cultural contexts.")
+        return _cultural_context(language)
     
     def _get_cache_key(self, text: str, publisher_name: str, language: str) -> str:
         """
@@ -369,8 +1116,35 @@ Return ONLY the JSON object, no additional text or explanation.
         Returns:
             Cache key string
         """
-        content = f"{text}|{publisher_name}|{language}"
-        return hashlib.md5(content.encode()).hexdigest()
+        # Feed the parts separately so page-sized text is not copied into one string;
+        # the model is part of the key so switching models never serves stale analyses
+        hasher = _cache_hasher()
+        hasher.update(text.encode())
+        hasher.update(b'|')
+        hasher.update(publisher_name.encode())
+        hasher.update(b'|')
+        hasher.update(language.encode())
+        hasher.update(b'|')
+        hasher.update(settings.CLAUDE_MODEL.encode())
+        return hasher.hexdigest()
+    
+    def _open_cache_db(self) -> sqlite3.Connection:
+        """
+        Open the analysis cache database, creating its table on first use.
+        
+        Returns:
+            SQLite connection in autocommit mode
+        """
+        db = sqlite3.connect(
+            self.cache_dir / CACHE_DB_NAME,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.execute('CREATE TABLE IF NOT EXISTS cache(key TEXT PRIMARY KEY, ts REAL NOT NULL, blob BLOB NOT NULL)')
+        db.execute('CREATE INDEX IF NOT EXISTS cache_ts ON cache(ts)')
+        return db
     
     def _get_cached_analysis(self, text: str, publisher_name: str, language: str) -> Optional[Dict]:
         """
@@ -385,30 +1159,52 @@ Return ONLY the JSON object, no additional text or explanation.
             Cached analysis results or None
         """
         cache_key = self._get_cache_key(text, publisher_name, language)
-        cache_file = self.cache_dir / f"{cache_key}.json"
         
-        if not cache_file.exists():
+        try:
+            with self._cache_db_lock:
+                memo = self._analysis_memo.get(cache_key)
+                if memo is None:
+                    row = self.cache_db.execute(
+                        'SELECT ts, blob FROM cache WHERE key = ?', (cache_key,)
+                    ).fetchone()
+                    if row is not None:
+                        memo = self._remember_analysis(cache_key, row[0], row[1])
+        except sqlite3.Error as e:
+            logger.warning(f"Cache lookup failed: {e}")
+            return None
+        
+        if memo is None:
+            return None
+        
+        # Decode on every hit so callers never share a mutable result
+        cache_time, blob = memo
+        
+        # Check if cache is expired
+        if time.time() > cache_time + settings.CACHE_EXPIRY_HOURS * 3600:
+            self._delete_cached(cache_key)  # Delete expired cache
             return None
         
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cached_data = json.load(f)
-            
-            # Check if cache is expired
-            cache_time = datetime.fromisoformat(cached_data.get('cache_timestamp', ''))
-            expiry_time = cache_time + timedelta(hours=settings.CACHE_EXPIRY_HOURS)
-            
-            if datetime.now() > expiry_time:
-                cache_file.unlink()  # Delete expired cache
-                return None
-            
-            return cached_data.get('analysis_result')
-            
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            logger.warning(f"Invalid cache file {cache_file}: {e}")
-            cache_file.unlink()  # Delete corrupted cache
+            return json_utils.loads(blob)
+        except ValueError as e:
+            logger.warning(f"Invalid cache entry {cache_key}: {e}")
+            self._delete_cached(cache_key)  # Delete corrupted cache
             return None
     
+    def _delete_cached(self, cache_key: str):
+        """
+        Remove a single cache entry.
+        
+        Args:
+            cache_key: Key of the entry to remove
+        """
+        try:
+            with self._cache_db_lock:
+                self._analysis_memo.pop(cache_key, None)
+                self.cache_db.execute('DELETE FROM cache WHERE key = ?', (cache_key,))
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to delete cache entry {cache_key}: {e}")
+    
     def _cache_analysis(self, text: str, publisher_name: str, language: str, result: Dict):
         """
         Cache analysis results.
@@ -420,25 +1216,43 @@ Return ONLY the JSON object, no additional text or explanation.
             result: Analysis results to cache
         """
         cache_key = self._get_cache_key(text, publisher_name, language)
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        
-        cache_data = {
-            'cache_timestamp': datetime.now().isoformat(),
-            'publisher_name': publisher_name,
-            'language': language,
-            'analysis_result': result
-        }
         
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            blob = json_utils.dumps(result, indent=False)
+            cache_time = time.time()
+            with self._cache_db_lock:
+                self._remember_analysis(cache_key, cache_time, blob)
+                self.cache_db.execute(
+                    'INSERT OR REPLACE INTO cache(key, ts, blob) VALUES (?, ?, ?)',
+                    (cache_key, cache_time, blob)
+                )
             logger.debug(f"Cached analysis for {publisher_name}")
         except Exception as e:
             logger.warning(f"Failed to cache analysis: {e}")
     
+    def _remember_analysis(self, cache_key: str, cache_time: float, blob: bytes) -> Tuple[float, bytes]:
+        """
+        Keep a serialized analysis in the in-memory layer.
+        
+        Must be called with _cache_db_lock held.
+        
+        Args:
+            cache_key: Cache key of the entry
+            cache_time: Time the entry was cached
+            blob: Serialized analysis results
+            
+        Returns:
+            The stored (timestamp, blob) pair
+        """
+        memo = (cache_time, blob)
+        self._analysis_memo[cache_key] = memo
+        if len(self._analysis_memo) > ANALYSIS_MEMO_SIZE:
+            del self._analysis_memo[next(iter(self._analysis_memo))]
+        return memo
+    
     def clear_cache(self, max_age_hours: Optional[int] = None):
         """
-        Clear expired cache files.
+        Clear expired cache entries.
         
         Args:
             max_age_hours: Maximum age in hours (use settings default if None)
@@ -446,24 +1260,19 @@ Return ONLY the JSON object, no additional text or explanation.
         if max_age_hours is None:
             max_age_hours = settings.CACHE_EXPIRY_HOURS
         
-        cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
-        cleared_count = 0
+        cutoff_time = time.time() - max_age_hours * 3600
         
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
-                
-                cache_time = datetime.fromisoformat(cached_data.get('cache_timestamp', ''))
-                
-                if cache_time < cutoff_time:
-                    cache_file.unlink()
-                    cleared_count += 1
-                    
-            except Exception as e:
-                logger.warning(f"Error processing cache file {cache_file}: {e}")
-                cache_file.unlink()  # Delete corrupted files
-                cleared_count += 1
+        try:
+            with self._cache_db_lock:
+                self._analysis_memo = {
+                    key: memo for key, memo in self._analysis_memo.items() if memo[0] >= cutoff_time
+                }
+                cleared_count = self.cache_db.execute(
+                    'DELETE FROM cache WHERE ts < ?', (cutoff_time,)
+                ).rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to clear cache: {e}")
+            return 0
         
-        logger.info(f"Cleared {cleared_count} expired cache files")
-        return cleared_count
\ No newline at end of file
+        logger.info(f"Cleared {cleared_count} expired cache entries")
+        return cleared_count
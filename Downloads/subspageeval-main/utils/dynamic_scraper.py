@@ -4,8 +4,14 @@ Includes visual scanning capabilities.
 """
 
 import asyncio
+import atexit
 import base64
+import hashlib
 import logging
+import os
+import threading
+import time
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
 from pathlib import Path
 from io import BytesIO
@@ -16,14 +22,240 @@ import pytesseract
 import cv2
 import numpy as np
 
+from config.settings import get_settings
+from utils import json_utils
+
 logger = logging.getLogger(__name__)
 
+# Screenshots wider than this are downscaled before OCR
+OCR_MAX_WIDTH = 1280
+
+# Pages open at once in the shared browser, which also bounds concurrent OCR runs
+SHARED_BROWSER_MAX_PAGES = 4
+
+# Pages with at least this much DOM text skip OCR
+OCR_DOM_TEXT_THRESHOLD = 1500
+
+# Tesseract traineddata names for the supported ISO 639-1 language codes
+TESSERACT_LANGUAGES = {
+    'cs': 'ces', 'pl': 'pol', 'sk': 'slk', 'hu': 'hun', 'ro': 'ron',
+    'de': 'deu', 'es': 'spa', 'fr': 'fra', 'lt': 'lit', 'lv': 'lav',
+    'pt': 'por', 'nl': 'nld', 'sv': 'swe', 'da': 'dan', 'fi': 'fin',
+    'no': 'nor', 'en': 'eng'
+}
+# LSTM engine only, skipping the slower legacy recognizer
+TESSERACT_CONFIG = '--oem 1'
+
+# Element groups whose text is collected, in output order
+TEXT_SELECTORS = (
+    'h1, h2, h3, h4, h5, h6',
+    'p',
+    'span',
+    'div',
+    'button',
+    'a',
+    'li',
+    'label',
+    '[class*="price"], [class*="cost"], [class*="amount"]',
+    '[class*="subscribe"], [class*="membership"], [class*="support"]',
+    '[class*="benefit"], [class*="feature"], [class*="perk"]'
+)
+
+# Scrolls the page in steps to trigger lazy loading, then returns to the top
+_SCROLL_JS = """
+async () => {
+    const distance = 500;
+    const delay = 100;
+    const height = document.body.scrollHeight;
+    
+    for (let i = 0; i < height; i += distance) {
+        window.scrollBy(0, distance);
+        await new Promise(resolve => setTimeout(resolve, delay));
+    }
+    
+    // Scroll back to top
+    window.scrollTo(0, 0);
+    await new Promise(resolve => setTimeout(resolve, 500));
+}
+"""
+
+# Collects trimmed element text per selector group, then the full body text,
+# deduplicated while preserving order
+_EXTRACT_TEXT_JS = """
+(selectors) => {
+    const seen = new Set();
+    const out = [];
+    const add = (text) => {
+        if (text && !seen.has(text)) {
+            seen.add(text);
+            out.push(text);
+        }
+    };
+    for (const selector of selectors) {
+        try {
+            document.querySelectorAll(selector).forEach(el => add((el.textContent || '').trim()));
+        } catch (e) {
+            // Skip selectors the page's DOM rejects
+        }
+    }
+    if (document.body) {
+        add(document.body.textContent);
+    }
+    return out;
+}
+"""
+
+# Unique currency amounts in the visible page text
+_PRICES_JS = """
+() => {
+    const priceRegex = /[$£€]\\d+\\.?\\d*/g;
+    const bodyText = document.body.innerText;
+    const prices = bodyText.match(priceRegex) || [];
+    return [...new Set(prices)];
+}
+"""
+
+
+@lru_cache(maxsize=1)
+def _installed_tesseract_languages() -> frozenset:
+    """Return the traineddata languages the local Tesseract can load."""
+    try:
+        return frozenset(pytesseract.get_languages())
+    except Exception as e:
+        logger.warning(f"Could not list Tesseract languages: {e}")
+        return frozenset()
+
+
+def _tesseract_language(language: Optional[str]) -> str:
+    """
+    Map a page language to the Tesseract model used to OCR it.
+    
+    Args:
+        language: ISO 639-1 language code, or None if unknown
+        
+    Returns:
+        Tesseract language name, English when the model is not installed
+    """
+    tess_lang = TESSERACT_LANGUAGES.get(language, 'eng')
+    if tess_lang != 'eng' and tess_lang not in _installed_tesseract_languages():
+        logger.warning(f"Tesseract model '{tess_lang}' not installed, using English for OCR")
+        return 'eng'
+    return tess_lang
+
+
+def _scrape_cache_paths(url: str, language: Optional[str]) -> Tuple[Path, Path]:
+    """Return the (results JSON, screenshot PNG) cache files for a URL."""
+    digest = hashlib.blake2b(f"{url}|{language or ''}".encode('utf-8'), digest_size=16).hexdigest()
+    cache_dir = get_settings().SCRAPE_CACHE_DIR
+    return cache_dir / f"{digest}.json", cache_dir / f"{digest}.png"
+
+
+def _load_cached_scrape(url: str, language: Optional[str]) -> Optional[Dict]:
+    """
+    Load a previous scrape of a URL if it has not expired.
+    
+    Args:
+        url: Scraped URL
+        language: Page language the scrape was made with
+        
+    Returns:
+        Scrape results, or None on a cache miss
+    """
+    settings = get_settings()
+    if not settings.CACHE_SCRAPES:
+        return None
+    
+    json_file, png_file = _scrape_cache_paths(url, language)
+    try:
+        if time.time() - json_file.stat().st_mtime > settings.SCRAPE_CACHE_EXPIRY_HOURS * 3600:
+            return None
+        results = json_utils.loads(json_file.read_bytes())
+        results['screenshot'] = None
+        if results.pop('has_screenshot', False):
+            results['screenshot'] = base64.b64encode(png_file.read_bytes()).decode('utf-8')
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Invalid scrape cache entry for {url}: {e}")
+        return None
+    
+    logger.info(f"Using cached scrape for {url}")
+    return results
+
+
+def _store_cached_scrape(results: Dict, language: Optional[str]):
+    """
+    Cache a successful scrape; screenshots are kept as PNG files, not base64.
+    
+    Args:
+        results: Result dictionary from DynamicScraper.scrape_page
+        language: Page language the scrape was made with
+    """
+    if results.get('error') or not get_settings().CACHE_SCRAPES:
+        return
+    
+    json_file, png_file = _scrape_cache_paths(results['url'], language)
+    entry = {key: value for key, value in results.items() if key != 'screenshot'}
+    entry['has_screenshot'] = results.get('screenshot') is not None
+    
+    try:
+        json_file.parent.mkdir(parents=True, exist_ok=True)
+        if entry['has_screenshot']:
+            png_file.write_bytes(base64.b64decode(results['screenshot']))
+        # The JSON file marks the entry complete, so it is written last and atomically
+        tmp_file = json_file.with_name(f"{json_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_bytes(json_utils.dumps(entry, indent=False))
+        os.replace(tmp_file, json_file)
+    except OSError as e:
+        logger.warning(f"Failed to cache scrape of {results['url']}: {e}")
+
+
+def _ocr_screenshot(screenshot_buffer: bytes, language: Optional[str] = None) -> str:
+    """
+    OCR a screenshot in the page language.
+    
+    Args:
+        screenshot_buffer: PNG screenshot bytes
+        language: ISO 639-1 code of the page language
+        
+    Returns:
+        Recognized text, or an empty string if OCR failed
+    """
+    try:
+        # Convert screenshot buffer to image
+        image = Image.open(BytesIO(screenshot_buffer))
+        
+        # Tesseract's cost scales with pixel count; page text stays legible
+        # at this width
+        if image.width > OCR_MAX_WIDTH:
+            image.thumbnail((OCR_MAX_WIDTH, image.height), Image.LANCZOS)
+        
+        # Screenshots are lossless renders, so no denoising is needed
+        # before the adaptive threshold
+        gray = np.array(image.convert('L'))
+        thresh = cv2.adaptiveThreshold(
+            gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
+            cv2.THRESH_BINARY, 11, 2
+        )
+        
+        # Run OCR
+        text = pytesseract.image_to_string(
+            thresh, lang=_tesseract_language(language), config=TESSERACT_CONFIG
+        )
+        
+        return text.strip()
+        
+    except Exception as e:
+        logger.error(f"OCR extraction failed: {e}")
+        return ""
+
 
 class DynamicScraper:
     """Scraper that handles JavaScript-rendered content and captures visual elements."""
     
     def __init__(self, headless: bool = True):
         self.headless = headless
+        self.playwright = None
         self.browser = None
         self.context = None
         
@@ -44,13 +276,16 @@ class DynamicScraper:
         if self.playwright:
             await self.playwright.stop()
     
-    async def scrape_page(self, url: str, wait_for_selector: str = None) -> Dict:
+    async def scrape_page(self, url: str, wait_for_selector: str = None,
+                          language: Optional[str] = None, capture_screenshot: bool = True) -> Dict:
         """
         Scrape a page with dynamic content handling.
         
         Args:
             url: URL to scrape
             wait_for_selector: CSS selector to wait for before extraction
+            language: ISO 639-1 code of the page language, used to pick the OCR model
+            capture_screenshot: Include the base64 screenshot in the results
             
         Returns:
             Dictionary with text content, screenshot, and metadata
@@ -90,13 +325,20 @@ class DynamicScraper:
             text_content = await self._extract_all_text(page)
             results['text'] = text_content
             
-            # Capture screenshot
-            screenshot_buffer = await page.screenshot(full_page=True)
-            results['screenshot'] = base64.b64encode(screenshot_buffer).decode('utf-8')
+            # OCR mostly repeats the DOM text once there is enough of it
+            needs_ocr = len(text_content) < OCR_DOM_TEXT_THRESHOLD
+            visual_text = ''
             
-            # Extract visual text using OCR
-            visual_text = await self._extract_visual_text(screenshot_buffer)
-            results['visual_text'] = visual_text
+            if capture_screenshot or needs_ocr:
+                # Capture screenshot
+                screenshot_buffer = await page.screenshot(full_page=True)
+                if capture_screenshot:
+                    results['screenshot'] = base64.b64encode(screenshot_buffer).decode('utf-8')
+                
+                # Extract visual text using OCR
+                if needs_ocr:
+                    visual_text = await self._extract_visual_text(screenshot_buffer, language)
+                    results['visual_text'] = visual_text
             
             # Get page metadata
             results['metadata'] = await self._get_page_metadata(page)
@@ -118,97 +360,23 @@ class DynamicScraper:
     
     async def _scroll_page(self, page):
         """Scroll through the page to trigger lazy loading."""
-        await page.evaluate("""
-            async () => {
-                const distance = 500;
-                const delay = 100;
-                const height = document.body.scrollHeight;
-                
-                for (let i = 0; i < height; i += distance) {
-                    window.scrollBy(0, distance);
-                    await new Promise(resolve => setTimeout(resolve, delay));
-                }
-                
-                // Scroll back to top
-                window.scrollTo(0, 0);
-                await new Promise(resolve => setTimeout(resolve, 500));
-            }
-        """)
+        await page.evaluate(_SCROLL_JS)
     
     async def _extract_all_text(self, page) -> str:
         """Extract text from various elements on the page."""
-        # Get text from specific elements
-        selectors = [
-            'h1, h2, h3, h4, h5, h6',
-            'p',
-            'span',
-            'div',
-            'button',
-            'a',
-            'li',
-            'label',
-            '[class*="price"], [class*="cost"], [class*="amount"]',
-            '[class*="subscribe"], [class*="membership"], [class*="support"]',
-            '[class*="benefit"], [class*="feature"], [class*="perk"]'
-        ]
-        
-        all_text = []
-        
-        for selector in selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                for element in elements:
-                    text = await element.text_content()
-                    if text and text.strip():
-                        all_text.append(text.strip())
-            except:
-                continue
-        
-        # Also get full page text as fallback
+        # Collected in the browser with one round trip
         try:
-            body_text = await page.text_content('body')
-            if body_text:
-                all_text.append(body_text)
-        except:
-            pass
-        
-        # Deduplicate while preserving order
-        seen = set()
-        unique_text = []
-        for text in all_text:
-            if text not in seen:
-                seen.add(text)
-                unique_text.append(text)
+            all_text = await page.evaluate(_EXTRACT_TEXT_JS, TEXT_SELECTORS)
+        except Exception as e:
+            logger.error(f"Text extraction failed: {e}")
+            return ''
         
-        return '\n'.join(unique_text)
+        return '\n'.join(all_text)
     
-    async def _extract_visual_text(self, screenshot_buffer: bytes) -> str:
-        """Extract text from screenshot using OCR."""
-        try:
-            # Convert screenshot buffer to image
-            image = Image.open(BytesIO(screenshot_buffer))
-            
-            # Convert to OpenCV format
-            cv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-            
-            # Preprocess for better OCR
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-            denoised = cv2.fastNlMeansDenoising(gray)
-            
-            # Apply adaptive threshold for better text detection
-            thresh = cv2.adaptiveThreshold(
-                denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                cv2.THRESH_BINARY, 11, 2
-            )
-            
-            # Run OCR
-            text = pytesseract.image_to_string(thresh)
-            
-            return text.strip()
-            
-        except Exception as e:
-            logger.error(f"OCR extraction failed: {e}")
-            return ""
+    async def _extract_visual_text(self, screenshot_buffer: bytes, language: Optional[str] = None) -> str:
+        """Extract text from screenshot using OCR in the page language."""
+        # Tesseract blocks, so it runs in a worker thread while other pages load
+        return await asyncio.to_thread(_ocr_screenshot, screenshot_buffer, language)
     
     async def _get_page_metadata(self, page) -> Dict:
         """Extract page metadata."""
@@ -224,14 +392,7 @@ class DynamicScraper:
                 metadata['description'] = await meta_desc.get_attribute('content')
             
             # Get pricing information
-            pricing_data = await page.evaluate("""
-                () => {
-                    const priceRegex = /[$£€]\\d+\\.?\\d*/g;
-                    const bodyText = document.body.innerText;
-                    const prices = bodyText.match(priceRegex) || [];
-                    return [...new Set(prices)];
-                }
-            """)
+            pricing_data = await page.evaluate(_PRICES_JS)
             metadata['prices'] = pricing_data
             
         except Exception as e:
@@ -240,12 +401,126 @@ class DynamicScraper:
         return metadata
 
 
-async def scrape_with_retry(url: str, max_retries: int = 3) -> Dict:
-    """Scrape a URL with retries."""
+class SharedBrowser:
+    """
+    One Chromium shared by every synchronous dynamic scrape in the process.
+    
+    Launching Chromium dominates the cost of a single scrape, and the CLI
+    scrapes from several worker threads at once. The browser runs on its own
+    event loop thread; callers submit coroutines to it and wait for the
+    result, and at most SHARED_BROWSER_MAX_PAGES pages are open at a time.
+    """
+    
+    def __init__(self, max_pages: int = SHARED_BROWSER_MAX_PAGES):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._scraper: Optional[DynamicScraper] = None
+        self._launch_lock = asyncio.Lock()
+        self._pages = asyncio.Semaphore(max_pages)
+    
+    def run(self, coro):
+        """
+        Run a coroutine on the browser's event loop and wait for its result.
+        
+        Args:
+            coro: Coroutine to run
+            
+        Returns:
+            The coroutine's result
+        """
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='shared-browser', daemon=True).start()
+                self._loop = loop
+                atexit.register(self.close)
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    async def scrape_page(self, url: str, language: Optional[str] = None) -> Dict:
+        """
+        Scrape a page in a new tab of the shared browser, launching it if needed.
+        
+        Args:
+            url: URL to scrape
+            language: ISO 639-1 code of the page language, used for OCR
+            
+        Returns:
+            Result dictionary from DynamicScraper.scrape_page
+        """
+        async with self._pages:
+            async with self._launch_lock:
+                if self._scraper is None:
+                    scraper = DynamicScraper()
+                    try:
+                        await scraper.__aenter__()
+                    except Exception:
+                        # Stop whatever part of Playwright did start
+                        await scraper.__aexit__(None, None, None)
+                        raise
+                    self._scraper = scraper
+                scraper = self._scraper
+            try:
+                return await scraper.scrape_page(url, language=language)
+            except Exception:
+                # A crashed browser is relaunched by the next scrape
+                if not scraper.browser.is_connected():
+                    await self._shutdown(scraper)
+                raise
+    
+    async def _shutdown(self, scraper: DynamicScraper):
+        """Close a scraper's browser unless another caller already replaced it."""
+        async with self._launch_lock:
+            if self._scraper is scraper:
+                self._scraper = None
+        try:
+            await scraper.__aexit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"Failed to close shared browser: {e}")
+    
+    def close(self):
+        """Close the browser and stop its event loop."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._scraper is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(self._scraper), loop).result(timeout=30)
+            except Exception as e:
+                logger.warning(f"Failed to close shared browser: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_shared_browser = SharedBrowser()
+
+
+async def scrape_with_retry(url: str, max_retries: int = 3, language: Optional[str] = None,
+                            browser: Optional[SharedBrowser] = None) -> Dict:
+    """
+    Scrape a URL with retries, reusing a cached scrape when there is one.
+    
+    Args:
+        url: URL to scrape
+        max_retries: Maximum number of attempts
+        language: ISO 639-1 code of the page language, used for OCR
+        browser: Shared browser to scrape in (a browser is launched for this URL otherwise)
+        
+    Returns:
+        Result dictionary from DynamicScraper.scrape_page
+    """
+    cached = _load_cached_scrape(url, language)
+    if cached is not None:
+        return cached
+    
     for attempt in range(max_retries):
         try:
-            async with DynamicScraper() as scraper:
-                return await scraper.scrape_page(url)
+            if browser is not None:
+                results = await browser.scrape_page(url, language)
+            else:
+                async with DynamicScraper() as scraper:
+                    results = await scraper.scrape_page(url, language=language)
+            _store_cached_scrape(results, language)
+            return results
         except Exception as e:
             logger.error(f"Attempt {attempt + 1} failed: {e}")
             if attempt == max_retries - 1:
@@ -260,30 +535,55 @@ async def scrape_with_retry(url: str, max_retries: int = 3) -> Dict:
             await asyncio.sleep(2 ** attempt)  # Exponential backoff
 
 
-def scrape_page_dynamic(url: str) -> Tuple[str, Optional[str], Dict]:
+def _merge_scrape_results(results: Dict) -> Tuple[str, Optional[str], Dict]:
+    """
+    Merge the DOM and OCR text of a scrape result.
+    
+    Args:
+        results: Result dictionary from DynamicScraper.scrape_page
+        
+    Returns:
+        Tuple of (combined_text, screenshot_base64, metadata)
+    """
+    # Combine text from DOM and OCR
+    dom_text = results.get('text', '')
+    ocr_text = results.get('visual_text', '')
+    
+    # Merge texts intelligently
+    combined = [dom_text]
+    if ocr_text:
+        # Add OCR text that's not already in DOM text. Lowercase the DOM
+        # once; lines matching a whole DOM line skip the substring scan
+        dom_lower = dom_text.lower()
+        dom_lines = {line.strip() for line in dom_lower.splitlines()}
+        for line in ocr_text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            line_lower = line.lower()
+            if line_lower not in dom_lines and line_lower not in dom_lower:
+                combined.append(line)
+    
+    return '\n'.join(combined), results.get('screenshot'), results.get('metadata', {})
+
+
+def scrape_page_dynamic(url: str, language: Optional[str] = None) -> Tuple[str, Optional[str], Dict]:
     """
     Synchronous wrapper for async scraper.
     
+    Scrapes from every thread share one browser, so concurrent callers do not
+    each launch Chromium.
+    
+    Args:
+        url: URL to scrape
+        language: ISO 639-1 code of the page language, used to pick the OCR model
+    
     Returns:
         Tuple of (combined_text, screenshot_base64, metadata)
     """
     try:
-        results = asyncio.run(scrape_with_retry(url))
-        
-        # Combine text from DOM and OCR
-        dom_text = results.get('text', '')
-        ocr_text = results.get('visual_text', '')
-        
-        # Merge texts intelligently
-        combined_text = dom_text
-        if ocr_text:
-            # Add OCR text that's not already in DOM text
-            ocr_lines = ocr_text.split('\n')
-            for line in ocr_lines:
-                if line.strip() and line.strip().lower() not in dom_text.lower():
-                    combined_text += f"\n{line.strip()}"
-        
-        return combined_text, results.get('screenshot'), results.get('metadata', {})
+        results = _shared_browser.run(scrape_with_retry(url, language=language, browser=_shared_browser))
+        return _merge_scrape_results(results)
         
     except Exception as e:
         logger.error(f"Dynamic scraping failed for {url}: {e}")
@@ -3,16 +3,61 @@ Enhanced analysis pipeline using Claude AI for multilingual subscription page an
 Replaces keyword-based analysis with AI-powered behavioral economics analysis.
 """
 
+import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 
-from utils.claude_analyzer import ClaudeAnalyzer
+from utils.claude_analyzer import COMBINED_MAX_PAGES, ClaudeAnalyzer
 from utils.text_processor import clean_text, count_words
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Scored result sections as (score fields, categories, has counts); missing
+# counts and examples default to zero counts and empty lists per category
+_MOTIVATION_SCHEMA = (
+    ('support_ratio', 'mission_density', 'feature_density', 'identity_score', 'community_score'),
+    ('support', 'transactional', 'mission', 'feature', 'identity', 'community'),
+    True
+)
+_BEHAVIORAL_SCHEMA = (
+    ('scarcity_score', 'social_proof_score', 'loss_aversion_score', 'reciprocity_score', 'authority_score'),
+    ('scarcity', 'social_proof', 'loss_aversion', 'reciprocity', 'authority'),
+    True
+)
+_HABIT_SCHEMA = (
+    ('temporal_score', 'frequency_score', 'convenience_score', 'platform_score'),
+    ('temporal', 'frequency', 'convenience', 'platform'),
+    True
+)
+_EMOTIONAL_SCHEMA = (
+    ('fear_score', 'hope_score', 'belonging_score', 'status_score'),
+    ('fear', 'hope', 'belonging', 'status'),
+    False
+)
+
+
+def _score_section(raw: Dict, schema: Tuple) -> Dict:
+    """
+    Build one scored result section from Claude output.
+    
+    Default counts and examples are only allocated for keys Claude left out.
+    
+    Args:
+        raw: Section as returned by Claude (may be empty)
+        schema: One of the section schemas above
+        
+    Returns:
+        Section dictionary in the report format
+    """
+    score_fields, categories, has_counts = schema
+    section = {field: raw.get(field, 0.0) for field in score_fields}
+    if has_counts:
+        section['counts'] = raw['counts'] if 'counts' in raw else dict.fromkeys(categories, 0)
+    section['examples'] = raw['examples'] if 'examples' in raw else {category: [] for category in categories}
+    return section
+
 
 class EnhancedAnalysisPipeline:
     """
@@ -37,9 +82,134 @@ class EnhancedAnalysisPipeline:
         Returns:
             Dictionary containing comprehensive analysis results
         """
+        if not text or text.isspace():
+            raise ValueError("Text content is empty or None")
+        
+        return self.analyze_texts([(text, publisher_name, language)])[0]
+    
+    def analyze_texts(self, items: Iterable[Tuple[str, str, str]],
+                      batch_size: int = COMBINED_MAX_PAGES) -> List[Dict]:
+        """
+        Analyze several pages, combining them into shared Claude requests.
+        
+        Args:
+            items: (text, publisher_name, language) tuples
+            batch_size: Maximum pages per Claude request
+            
+        Returns:
+            Analysis results in input order; pages whose analysis failed get
+            fallback results carrying the error
+        """
+        items = list(items)
+        results: List[Optional[Dict]] = [None] * len(items)
+        word_counts = [0] * len(items)
+        
+        # Pages with no text fail on their own without a Claude request
+        pending = []
+        for index, (text, publisher_name, _) in enumerate(items):
+            try:
+                word_counts[index] = self._count_page_words(text, publisher_name)
+            except ValueError as e:
+                results[index] = self._create_fallback_results(publisher_name, 0, str(e))
+            else:
+                pending.append(index)
+        
+        # Get Claude AI analysis; failures come back as exceptions per page
+        claude_results = self.claude_analyzer.analyze_combined(
+            [items[index] for index in pending], max_pages=batch_size
+        )
+        
+        for index, claude_result in zip(pending, claude_results):
+            results[index] = self._complete_results(claude_result, items[index][1], word_counts[index])
+        
+        return results
+    
+    async def analyze_text_async(self, text: str, publisher_name: str, language: str = 'auto') -> Dict:
+        """
+        Perform comprehensive analysis using the async Claude client.
+        
+        Args:
+            text: Cleaned text from subscription page
+            publisher_name: Name of the publisher
+            language: Language code (auto-detect if 'auto')
+            
+        Returns:
+            Dictionary containing comprehensive analysis results
+        """
+        total_words = self._count_page_words(text, publisher_name)
+        
+        try:
+            claude_results = await self.claude_analyzer.analyze_subscription_page_async(
+                text, publisher_name, language
+            )
+        except Exception as e:
+            claude_results = e
+        
+        return self._complete_results(claude_results, publisher_name, total_words)
+    
+    async def analyze_texts_async(self, items: Iterable[Tuple[str, str, str]],
+                                  max_concurrency: Optional[int] = None) -> List[Dict]:
+        """
+        Analyze several pages concurrently with the async Claude client.
+        
+        Args:
+            items: (text, publisher_name, language) tuples
+            max_concurrency: Maximum in-flight analyses (defaults to MAX_CONCURRENT_ANALYSES)
+            
+        Returns:
+            Analysis results in input order; pages whose analysis failed get
+            fallback results carrying the error
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.MAX_CONCURRENT_ANALYSES)
+        
+        async def analyze_one(text: str, publisher_name: str, language: str) -> Dict:
+            async with semaphore:
+                try:
+                    return await self.analyze_text_async(text, publisher_name, language)
+                except ValueError as e:
+                    return self._create_fallback_results(publisher_name, 0, str(e))
+        
+        return await asyncio.gather(*(analyze_one(*item) for item in items))
+    
+    def run_all(self, items: Iterable[Tuple[str, str, str]],
+                max_concurrency: Optional[int] = None) -> List[Dict]:
+        """
+        Synchronous facade for analyze_texts_async.
+        
+        Args:
+            items: (text, publisher_name, language) tuples
+            max_concurrency: Maximum in-flight analyses (defaults to MAX_CONCURRENT_ANALYSES)
+            
+        Returns:
+            Analysis results in input order
+        """
+        async def run():
+            try:
+                return await self.analyze_texts_async(items, max_concurrency)
+            finally:
+                # asyncio.run closes its loop, so release the client bound to it
+                await self.claude_analyzer.close_async_client()
+        
+        return asyncio.run(run())
+    
+    def _count_page_words(self, text: str, publisher_name: str) -> int:
+        """
+        Validate page text and count its words.
+        
+        Args:
+            text: Cleaned text from subscription page
+            publisher_name: Name of the publisher
+            
+        Returns:
+            Total word count
+            
+        Raises:
+            ValueError: If the text is empty
+        """
         logger.info(f"Starting enhanced analysis for {publisher_name}")
         
-        if not text or not text.strip():
+        # isspace() gives the same answer as strip() without copying the page
+        if not text or text.isspace():
             raise ValueError("Text content is empty or None")
         
         # Get total word count
@@ -48,11 +218,23 @@ class EnhancedAnalysisPipeline:
         if total_words < 10:
             logger.warning(f"Very short content for {publisher_name}: {total_words} words")
         
+        return total_words
+    
+    def _complete_results(self, claude_results, publisher_name: str, total_words: int) -> Dict:
+        """
+        Turn a Claude analysis, or the exception it raised, into pipeline results.
+        
+        Args:
+            claude_results: Raw results from Claude analysis, or an exception
+            publisher_name: Name of the publisher
+            total_words: Total word count
+            
+        Returns:
+            Transformed results, or fallback results if the analysis failed
+        """
         try:
-            # Get Claude AI analysis
-            claude_results = self.claude_analyzer.analyze_subscription_page(
-                text, publisher_name, language
-            )
+            if isinstance(claude_results, Exception):
+                raise claude_results
             
             # Transform Claude results to match expected format
             transformed_results = self._transform_claude_results(claude_results, total_words)
@@ -104,63 +286,16 @@ class EnhancedAnalysisPipeline:
             'total_words': total_words,
             
             # Motivation Framework (compatible with existing format)
-            'motivation_framework': {
-                'support_ratio': motivation.get('support_ratio', 0.0),
-                'mission_density': motivation.get('mission_density', 0.0),
-                'feature_density': motivation.get('feature_density', 0.0),
-                'identity_score': motivation.get('identity_score', 0.0),
-                'community_score': motivation.get('community_score', 0.0),
-                'counts': motivation.get('counts', {
-                    'support': 0, 'transactional': 0, 'mission': 0,
-                    'feature': 0, 'identity': 0, 'community': 0
-                }),
-                'examples': motivation.get('examples', {
-                    'support': [], 'transactional': [], 'mission': [],
-                    'feature': [], 'identity': [], 'community': []
-                })
-            },
+            'motivation_framework': _score_section(motivation, _MOTIVATION_SCHEMA),
             
             # Behavioral Triggers (enhanced with authority)
-            'behavioral_triggers': {
-                'scarcity_score': behavioral.get('scarcity_score', 0.0),
-                'social_proof_score': behavioral.get('social_proof_score', 0.0),
-                'loss_aversion_score': behavioral.get('loss_aversion_score', 0.0),
-                'reciprocity_score': behavioral.get('reciprocity_score', 0.0),
-                'authority_score': behavioral.get('authority_score', 0.0),  # New
-                'counts': behavioral.get('counts', {
-                    'scarcity': 0, 'social_proof': 0, 'loss_aversion': 0,
-                    'reciprocity': 0, 'authority': 0
-                }),
-                'examples': behavioral.get('examples', {
-                    'scarcity': [], 'social_proof': [], 'loss_aversion': [],
-                    'reciprocity': [], 'authority': []
-                })
-            },
+            'behavioral_triggers': _score_section(behavioral, _BEHAVIORAL_SCHEMA),
             
             # Habit Formation (compatible with existing format)
-            'habit_formation': {
-                'temporal_score': habit.get('temporal_score', 0.0),
-                'frequency_score': habit.get('frequency_score', 0.0),
-                'convenience_score': habit.get('convenience_score', 0.0),
-                'platform_score': habit.get('platform_score', 0.0),
-                'counts': habit.get('counts', {
-                    'temporal': 0, 'frequency': 0, 'convenience': 0, 'platform': 0
-                }),
-                'examples': habit.get('examples', {
-                    'temporal': [], 'frequency': [], 'convenience': [], 'platform': []
-                })
-            },
+            'habit_formation': _score_section(habit, _HABIT_SCHEMA),
             
             # New: Emotional Appeals
-            'emotional_appeals': {
-                'fear_score': emotional.get('fear_score', 0.0),
-                'hope_score': emotional.get('hope_score', 0.0),
-                'belonging_score': emotional.get('belonging_score', 0.0),
-                'status_score': emotional.get('status_score', 0.0),
-                'examples': emotional.get('examples', {
-                    'fear': [], 'hope': [], 'belonging': [], 'status': []
-                })
-            },
+            'emotional_appeals': _score_section(emotional, _EMOTIONAL_SCHEMA),
             
             # New: Cultural Adaptations
             'cultural_adaptations': {
@@ -215,10 +350,13 @@ class EnhancedAnalysisPipeline:
         """
         sentences = []
         for example in examples[:max_sentences]:
-            if isinstance(example, str) and len(example.strip()) > 10:
-                sentences.append(example.strip())
+            if isinstance(example, str):
+                sentence = example.strip()
+                if len(sentence) > 10:
+                    sentences.append(sentence)
         
-        return sentences[:max_sentences]
+        # At most max_sentences examples are scanned, so no final slice is needed
+        return sentences
     
     def _create_fallback_results(self, publisher_name: str, total_words: int, error_msg: str) -> Dict:
         """
@@ -244,46 +382,10 @@ class EnhancedAnalysisPipeline:
             'analysis_timestamp': datetime.now().isoformat(),
             
             # Empty structure for compatibility
-            'motivation_framework': {
-                'support_ratio': 0.0,
-                'mission_density': 0.0,
-                'feature_density': 0.0,
-                'identity_score': 0.0,
-                'community_score': 0.0,
-                'counts': {'support': 0, 'transactional': 0, 'mission': 0,
-                          'feature': 0, 'identity': 0, 'community': 0},
-                'examples': {'support': [], 'transactional': [], 'mission': [],
-                           'feature': [], 'identity': [], 'community': []}
-            },
-            
-            'behavioral_triggers': {
-                'scarcity_score': 0.0,
-                'social_proof_score': 0.0,
-                'loss_aversion_score': 0.0,
-                'reciprocity_score': 0.0,
-                'authority_score': 0.0,
-                'counts': {'scarcity': 0, 'social_proof': 0, 'loss_aversion': 0,
-                          'reciprocity': 0, 'authority': 0},
-                'examples': {'scarcity': [], 'social_proof': [], 'loss_aversion': [],
-                           'reciprocity': [], 'authority': []}
-            },
-            
-            'habit_formation': {
-                'temporal_score': 0.0,
-                'frequency_score': 0.0,
-                'convenience_score': 0.0,
-                'platform_score': 0.0,
-                'counts': {'temporal': 0, 'frequency': 0, 'convenience': 0, 'platform': 0},
-                'examples': {'temporal': [], 'frequency': [], 'convenience': [], 'platform': []}
-            },
-            
-            'emotional_appeals': {
-                'fear_score': 0.0,
-                'hope_score': 0.0,
-                'belonging_score': 0.0,
-                'status_score': 0.0,
-                'examples': {'fear': [], 'hope': [], 'belonging': [], 'status': []}
-            },
+            'motivation_framework': _score_section({}, _MOTIVATION_SCHEMA),
+            'behavioral_triggers': _score_section({}, _BEHAVIORAL_SCHEMA),
+            'habit_formation': _score_section({}, _HABIT_SCHEMA),
+            'emotional_appeals': _score_section({}, _EMOTIONAL_SCHEMA),
             
             'cultural_adaptations': {
                 'cultural_elements': [],
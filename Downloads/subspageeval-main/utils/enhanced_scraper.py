@@ -9,11 +9,19 @@ from .dynamic_scraper import scrape_page_dynamic
 
 logger = logging.getLogger(__name__)
 
+# Static text longer than this is used as is and dynamic scraping is skipped,
+# which also bounds the static side of the merge below
+STATIC_MIN_TEXT_LENGTH = 500
 
-def scrape_page_enhanced(url: str) -> Tuple[Optional[str], Optional[str], Dict]:
+
+def scrape_page_enhanced(url: str, language: Optional[str] = None) -> Tuple[Optional[str], Optional[str], Dict]:
     """
     Enhanced scraping that tries static first, then falls back to dynamic.
     
+    Args:
+        url: URL to scrape
+        language: ISO 639-1 code of the page language, used for OCR (optional)
+    
     Returns:
         Tuple of (text_content, screenshot_base64, metadata)
     """
@@ -22,28 +30,39 @@ def scrape_page_enhanced(url: str) -> Tuple[Optional[str], Optional[str], Dict]:
     # First try static scraping
     static_text = scrape_static(url)
     
-    if static_text and len(static_text) > 500:
+    if static_text and len(static_text) > STATIC_MIN_TEXT_LENGTH:
         # Static scraping worked well
         logger.info(f"Static scraping successful for {url}")
         return static_text, None, {}
     
     # Static scraping didn't get much content, try dynamic
     logger.info(f"Falling back to dynamic scraping for {url}")
-    dynamic_text, screenshot, metadata = scrape_page_dynamic(url)
+    dynamic_text, screenshot, metadata = scrape_page_dynamic(url, language)
     
     # Combine static and dynamic results if both have content
     if static_text and dynamic_text:
         # Use dynamic as base and add unique content from static
-        combined_text = dynamic_text
-        static_lower = static_text.lower()
+        combined = [dynamic_text]
         dynamic_lower = dynamic_text.lower()
+        # Sentences repeated verbatim skip the substring scan below
+        dynamic_sentences = {sentence.strip() for sentence in dynamic_lower.split('.')}
+        # Static sentences already scanned for, so repeats never rescan the dynamic text
+        is_new = {}
         
         # Add static content not in dynamic
         for sentence in static_text.split('.'):
-            if sentence.strip() and sentence.strip().lower() not in dynamic_lower:
-                combined_text += f" {sentence.strip()}."
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            sentence_lower = sentence.lower()
+            new = is_new.get(sentence_lower)
+            if new is None:
+                new = sentence_lower not in dynamic_sentences and sentence_lower not in dynamic_lower
+                is_new[sentence_lower] = new
+            if new:
+                combined.append(f" {sentence}.")
         
-        return combined_text, screenshot, metadata
+        return ''.join(combined), screenshot, metadata
     
     # Return whichever has content
     return dynamic_text or static_text or '', screenshot, metadata
\ No newline at end of file
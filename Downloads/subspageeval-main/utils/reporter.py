@@ -2,13 +2,18 @@
 Report generation functions for subscription page analysis.
 """
 
-import json
 import csv
 import os
+from collections import Counter
 from typing import List, Dict
 from datetime import datetime
 import logging
 
+import numpy as np
+
+from utils import json_utils
+from utils.analyzer import get_innovation_indicators
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,8 +33,8 @@ def save_individual_report(results: Dict, output_dir: str) -> bool:
         filename = f"{publisher_name}_analysis.json"
         filepath = os.path.join(output_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            f.write(json_utils.dumps(results))
         
         logger.info(f"Saved individual report to {filepath}")
         return True
@@ -39,13 +44,94 @@ def save_individual_report(results: Dict, output_dir: str) -> bool:
         return False
 
 
-def generate_comparative_csv(all_results: List[Dict], output_dir: str) -> bool:
+# Column order of the comparative CSV; _comparative_row yields values in this order
+COMPARATIVE_CSV_FIELDS = (
+    'publisher_name',
+    'sophistication_score',
+    'primary_strategy',
+    'total_words',
+    # Motivation scores
+    'support_ratio',
+    'mission_density',
+    'feature_density',
+    'identity_score',
+    'community_score',
+    # Behavioral scores
+    'scarcity_score',
+    'social_proof_score',
+    'loss_aversion_score',
+    'reciprocity_score',
+    # Habit scores
+    'temporal_score',
+    'frequency_score',
+    'convenience_score',
+    'platform_score',
+    # Counts
+    'support_count',
+    'transactional_count',
+    'mission_count',
+    'scarcity_count',
+    'social_proof_count',
+    'price_mentions'
+)
+
+
+def _comparative_row(result: Dict) -> tuple:
+    """Build one comparative CSV row, in COMPARATIVE_CSV_FIELDS order."""
+    motivation = result['motivation_framework']
+    behavioral = result['behavioral_triggers']
+    habit = result['habit_formation']
+    motivation_counts = motivation['counts']
+    behavioral_counts = behavioral['counts']
+    return (
+        result['publisher_name'],
+        result['sophistication_score'],
+        result['primary_strategy'],
+        result['total_words'],
+        # Motivation scores
+        motivation['support_ratio'],
+        motivation['mission_density'],
+        motivation['feature_density'],
+        motivation['identity_score'],
+        motivation['community_score'],
+        # Behavioral scores
+        behavioral['scarcity_score'],
+        behavioral['social_proof_score'],
+        behavioral['loss_aversion_score'],
+        behavioral['reciprocity_score'],
+        # Habit scores
+        habit['temporal_score'],
+        habit['frequency_score'],
+        habit['convenience_score'],
+        habit['platform_score'],
+        # Counts
+        motivation_counts['support'],
+        motivation_counts['transactional'],
+        motivation_counts['mission'],
+        behavioral_counts['scarcity'],
+        behavioral_counts['social_proof'],
+        result['pricing_mentions']['count']
+    )
+
+
+def sort_results(all_results: List[Dict]):
+    """
+    Sort results in place by sophistication score, highest first.
+    
+    Args:
+        all_results: List of all publisher analysis results
+    """
+    all_results.sort(key=lambda x: x.get('sophistication_score', 0), reverse=True)
+
+
+def generate_comparative_csv(all_results: List[Dict], output_dir: str, assume_sorted: bool = False) -> bool:
     """
     Generate comparative analysis CSV file.
     
     Args:
         all_results: List of all publisher analysis results
         output_dir: Directory to save the CSV
+        assume_sorted: Skip sorting when the caller already ran sort_results
         
     Returns:
         True if successful
@@ -54,74 +140,13 @@ def generate_comparative_csv(all_results: List[Dict], output_dir: str) -> bool:
         filepath = os.path.join(output_dir, 'comparative_analysis.csv')
         
         # Sort by sophistication score
-        all_results.sort(key=lambda x: x.get('sophistication_score', 0), reverse=True)
+        if not assume_sorted:
+            sort_results(all_results)
         
         with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            # Define fieldnames
-            fieldnames = [
-                'publisher_name',
-                'sophistication_score',
-                'primary_strategy',
-                'total_words',
-                # Motivation scores
-                'support_ratio',
-                'mission_density',
-                'feature_density',
-                'identity_score',
-                'community_score',
-                # Behavioral scores
-                'scarcity_score',
-                'social_proof_score',
-                'loss_aversion_score',
-                'reciprocity_score',
-                # Habit scores
-                'temporal_score',
-                'frequency_score',
-                'convenience_score',
-                'platform_score',
-                # Counts
-                'support_count',
-                'transactional_count',
-                'mission_count',
-                'scarcity_count',
-                'social_proof_count',
-                'price_mentions'
-            ]
-            
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for result in all_results:
-                row = {
-                    'publisher_name': result['publisher_name'],
-                    'sophistication_score': result['sophistication_score'],
-                    'primary_strategy': result['primary_strategy'],
-                    'total_words': result['total_words'],
-                    # Motivation scores
-                    'support_ratio': result['motivation_framework']['support_ratio'],
-                    'mission_density': result['motivation_framework']['mission_density'],
-                    'feature_density': result['motivation_framework']['feature_density'],
-                    'identity_score': result['motivation_framework']['identity_score'],
-                    'community_score': result['motivation_framework']['community_score'],
-                    # Behavioral scores
-                    'scarcity_score': result['behavioral_triggers']['scarcity_score'],
-                    'social_proof_score': result['behavioral_triggers']['social_proof_score'],
-                    'loss_aversion_score': result['behavioral_triggers']['loss_aversion_score'],
-                    'reciprocity_score': result['behavioral_triggers']['reciprocity_score'],
-                    # Habit scores
-                    'temporal_score': result['habit_formation']['temporal_score'],
-                    'frequency_score': result['habit_formation']['frequency_score'],
-                    'convenience_score': result['habit_formation']['convenience_score'],
-                    'platform_score': result['habit_formation']['platform_score'],
-                    # Counts
-                    'support_count': result['motivation_framework']['counts']['support'],
-                    'transactional_count': result['motivation_framework']['counts']['transactional'],
-                    'mission_count': result['motivation_framework']['counts']['mission'],
-                    'scarcity_count': result['behavioral_triggers']['counts']['scarcity'],
-                    'social_proof_count': result['behavioral_triggers']['counts']['social_proof'],
-                    'price_mentions': result['pricing_mentions']['count']
-                }
-                writer.writerow(row)
+            writer = csv.writer(f)
+            writer.writerow(COMPARATIVE_CSV_FIELDS)
+            writer.writerows(_comparative_row(result) for result in all_results)
         
         logger.info(f"Saved comparative CSV to {filepath}")
         return True
@@ -131,13 +156,101 @@ def generate_comparative_csv(all_results: List[Dict], output_dir: str) -> bool:
         return False
 
 
-def generate_summary_report(all_results: List[Dict], output_dir: str) -> bool:
+# Market-wide averages: (label, results section, metric key)
+SUMMARY_METRICS = (
+    ('Support vs Transactional Ratio', 'motivation_framework', 'support_ratio'),
+    ('Mission Messaging Density', 'motivation_framework', 'mission_density'),
+    ('Community Focus', 'motivation_framework', 'community_score'),
+    ('Scarcity Tactics', 'behavioral_triggers', 'scarcity_score'),
+    ('Social Proof Usage', 'behavioral_triggers', 'social_proof_score')
+)
+
+# Behavioral triggers counted as used when their score is positive
+SUMMARY_TECHNIQUES = (
+    ('Scarcity', 'scarcity_score'),
+    ('Social Proof', 'social_proof_score'),
+    ('Loss Aversion', 'loss_aversion_score'),
+    ('Reciprocity', 'reciprocity_score')
+)
+
+# Example phrase categories: (heading, results section, examples key)
+SUMMARY_EXAMPLE_CATEGORIES = (
+    ('Mission-Driven', 'motivation_framework', 'mission'),
+    ('Community Building', 'motivation_framework', 'community'),
+    ('Scarcity', 'behavioral_triggers', 'scarcity'),
+    ('Social Proof', 'behavioral_triggers', 'social_proof'),
+    ('Reciprocity', 'behavioral_triggers', 'reciprocity')
+)
+
+
+def _summarize_results(all_results: List[Dict]) -> Dict:
+    """
+    Accumulate every summary report statistic in one pass over the results.
+    
+    Args:
+        all_results: Publisher analysis results, sorted by sophistication score
+        
+    Returns:
+        Dictionary of averages, counts and collected examples
+        
+    Raises:
+        ValueError: If there are no results
+    """
+    if not all_results:
+        raise ValueError("No results to summarize")
+    
+    # Column 0 is the sophistication score, then one column per SUMMARY_METRICS entry
+    scores = np.empty((len(all_results), 1 + len(SUMMARY_METRICS)), dtype=np.float64)
+    strategies = Counter()
+    innovation_count = Counter()
+    technique_usage = Counter({name: 0 for name, _ in SUMMARY_TECHNIQUES})
+    technique_usage['Habit Formation'] = 0
+    examples_found = [[] for _ in SUMMARY_EXAMPLE_CATEGORIES]
+    
+    for index, result in enumerate(all_results):
+        behavioral = result['behavioral_triggers']
+        
+        row = scores[index]
+        row[0] = result['sophistication_score']
+        for column, (_, section, metric_key) in enumerate(SUMMARY_METRICS, 1):
+            row[column] = result[section][metric_key]
+        
+        strategies[result['primary_strategy']] += 1
+        innovation_count.update(get_innovation_indicators(result))
+        
+        for name, score_key in SUMMARY_TECHNIQUES:
+            if behavioral[score_key] > 0:
+                technique_usage[name] += 1
+        if sum(result['habit_formation']['counts'].values()) > 5:
+            technique_usage['Habit Formation'] += 1
+        
+        # Examples come from the top 10 publishers only
+        if index < 10:
+            for found, (_, section, example_key) in zip(examples_found, SUMMARY_EXAMPLE_CATEGORIES):
+                examples = result[section]['examples'].get(example_key, [])
+                for example in examples[:2]:  # Get up to 2 examples per publisher
+                    if example and len(example) > 20:  # Skip very short examples
+                        found.append((result['publisher_name'], example))
+    
+    means = scores.mean(axis=0)
+    return {
+        'avg_sophistication': float(means[0]),
+        'strategies': strategies,
+        'innovation_count': innovation_count,
+        'metric_means': [float(mean) for mean in means[1:]],
+        'technique_usage': technique_usage,
+        'examples_found': examples_found
+    }
+
+
+def generate_summary_report(all_results: List[Dict], output_dir: str, assume_sorted: bool = False) -> bool:
     """
     Generate markdown summary report with insights.
     
     Args:
         all_results: List of all publisher analysis results
         output_dir: Directory to save the report
+        assume_sorted: Skip sorting when the caller already ran sort_results
         
     Returns:
         True if successful
@@ -146,133 +259,92 @@ def generate_summary_report(all_results: List[Dict], output_dir: str) -> bool:
         filepath = os.path.join(output_dir, 'subscription_language_analysis_report.md')
         
         # Sort by sophistication score
-        all_results.sort(key=lambda x: x.get('sophistication_score', 0), reverse=True)
+        if not assume_sorted:
+            sort_results(all_results)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            # Header
-            f.write("# Subscription Language Analysis Report\n\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            
-            # Executive Summary
-            f.write("## Executive Summary\n\n")
-            f.write(f"Analyzed {len(all_results)} publisher subscription pages to identify behavioral economics principles in marketing copy.\n\n")
-            
-            # Key findings
-            f.write("### Key Findings\n\n")
-            
-            # Average scores
-            avg_sophistication = sum(r['sophistication_score'] for r in all_results) / len(all_results)
-            f.write(f"- **Average Sophistication Score**: {avg_sophistication:.2f}/10\n")
-            
-            # Strategy distribution
-            strategies = {}
-            for r in all_results:
-                strategy = r['primary_strategy']
-                strategies[strategy] = strategies.get(strategy, 0) + 1
-            
-            f.write("- **Strategy Distribution**:\n")
-            for strategy, count in sorted(strategies.items(), key=lambda x: x[1], reverse=True):
-                percentage = (count / len(all_results)) * 100
-                f.write(f"  - {strategy}: {count} ({percentage:.1f}%)\n")
-            
-            # Top performers
-            f.write("\n### Top 5 Most Sophisticated Publishers\n\n")
-            f.write("| Rank | Publisher | Score | Primary Strategy |\n")
-            f.write("|------|-----------|-------|------------------|\n")
-            for i, result in enumerate(all_results[:5], 1):
-                f.write(f"| {i} | {result['publisher_name']} | {result['sophistication_score']:.2f} | {result['primary_strategy']} |\n")
-            
-            # Innovation highlights
-            f.write("\n## Innovation Highlights\n\n")
-            from utils.analyzer import get_innovation_indicators
-            
-            innovation_count = {}
-            for result in all_results:
-                innovations = get_innovation_indicators(result)
-                for innovation in innovations:
-                    innovation_count[innovation] = innovation_count.get(innovation, 0) + 1
-            
-            if innovation_count:
-                f.write("Most common innovative approaches:\n\n")
-                for innovation, count in sorted(innovation_count.items(), key=lambda x: x[1], reverse=True)[:5]:
-                    f.write(f"- **{innovation}**: Used by {count} publishers\n")
-            
-            # Market-wide statistics
-            f.write("\n## Market-Wide Statistics\n\n")
-            
-            # Calculate averages for key metrics
-            metrics = {
-                'Support vs Transactional Ratio': 'support_ratio',
-                'Mission Messaging Density': 'mission_density',
-                'Community Focus': 'community_score',
-                'Scarcity Tactics': 'scarcity_score',
-                'Social Proof Usage': 'social_proof_score'
-            }
-            
-            f.write("### Average Scores Across All Publishers\n\n")
-            for metric_name, metric_key in metrics.items():
-                if metric_key in ['support_ratio']:
-                    values = [r['motivation_framework'][metric_key] for r in all_results]
-                elif metric_key in ['mission_density', 'community_score']:
-                    values = [r['motivation_framework'][metric_key] for r in all_results]
-                else:
-                    values = [r['behavioral_triggers'][metric_key] for r in all_results]
-                
-                avg_value = sum(values) / len(values)
-                f.write(f"- **{metric_name}**: {avg_value:.4f}\n")
-            
-            # Behavioral techniques usage
-            f.write("\n### Behavioral Economics Techniques Usage\n\n")
-            technique_usage = {
-                'Scarcity': sum(1 for r in all_results if r['behavioral_triggers']['scarcity_score'] > 0),
-                'Social Proof': sum(1 for r in all_results if r['behavioral_triggers']['social_proof_score'] > 0),
-                'Loss Aversion': sum(1 for r in all_results if r['behavioral_triggers']['loss_aversion_score'] > 0),
-                'Reciprocity': sum(1 for r in all_results if r['behavioral_triggers']['reciprocity_score'] > 0),
-                'Habit Formation': sum(1 for r in all_results if sum(r['habit_formation']['counts'].values()) > 5)
-            }
-            
-            for technique, count in sorted(technique_usage.items(), key=lambda x: x[1], reverse=True):
-                percentage = (count / len(all_results)) * 100
-                f.write(f"- **{technique}**: {count} publishers ({percentage:.1f}%)\n")
-            
-            # Example phrases
-            f.write("\n## Notable Example Phrases\n\n")
-            
-            # Collect best examples
-            example_categories = [
-                ('Mission-Driven', 'motivation_framework', 'mission'),
-                ('Community Building', 'motivation_framework', 'community'),
-                ('Scarcity', 'behavioral_triggers', 'scarcity'),
-                ('Social Proof', 'behavioral_triggers', 'social_proof'),
-                ('Reciprocity', 'behavioral_triggers', 'reciprocity')
-            ]
-            
-            for category_name, section, example_key in example_categories:
-                f.write(f"### {category_name} Examples\n\n")
-                examples_found = []
-                
-                for result in all_results[:10]:  # Check top 10 publishers
-                    examples = result[section]['examples'].get(example_key, [])
-                    for example in examples[:2]:  # Get up to 2 examples per publisher
-                        if example and len(example) > 20:  # Skip very short examples
-                            examples_found.append((result['publisher_name'], example))
-                
-                for publisher, example in examples_found[:5]:  # Show top 5 examples
-                    f.write(f"- **{publisher}**: \"{example}\"\n")
-                
-                if not examples_found:
-                    f.write("- No notable examples found\n")
-                f.write("\n")
+        total = len(all_results)
+        stats = _summarize_results(all_results)
+        
+        # Build the report in memory and write it with a single call
+        parts = []
+        write = parts.append
+        
+        # Header
+        write("# Subscription Language Analysis Report\n\n")
+        write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        
+        # Executive Summary
+        write("## Executive Summary\n\n")
+        write(f"Analyzed {total} publisher subscription pages to identify behavioral economics principles in marketing copy.\n\n")
+        
+        # Key findings
+        write("### Key Findings\n\n")
+        
+        # Average scores
+        avg_sophistication = stats['avg_sophistication']
+        write(f"- **Average Sophistication Score**: {avg_sophistication:.2f}/10\n")
+        
+        # Strategy distribution
+        write("- **Strategy Distribution**:\n")
+        for strategy, count in stats['strategies'].most_common():
+            percentage = (count / total) * 100
+            write(f"  - {strategy}: {count} ({percentage:.1f}%)\n")
+        
+        # Top performers
+        write("\n### Top 5 Most Sophisticated Publishers\n\n")
+        write("| Rank | Publisher | Score | Primary Strategy |\n")
+        write("|------|-----------|-------|------------------|\n")
+        for i, result in enumerate(all_results[:5], 1):
+            write(f"| {i} | {result['publisher_name']} | {result['sophistication_score']:.2f} | {result['primary_strategy']} |\n")
+        
+        # Innovation highlights
+        write("\n## Innovation Highlights\n\n")
+        
+        innovation_count = stats['innovation_count']
+        if innovation_count:
+            write("Most common innovative approaches:\n\n")
+            for innovation, count in innovation_count.most_common(5):
+                write(f"- **{innovation}**: Used by {count} publishers\n")
+        
+        # Market-wide statistics
+        write("\n## Market-Wide Statistics\n\n")
+        
+        # Averages for key metrics
+        write("### Average Scores Across All Publishers\n\n")
+        for (metric_name, _, _), avg_value in zip(SUMMARY_METRICS, stats['metric_means']):
+            write(f"- **{metric_name}**: {avg_value:.4f}\n")
+        
+        # Behavioral techniques usage
+        write("\n### Behavioral Economics Techniques Usage\n\n")
+        for technique, count in stats['technique_usage'].most_common():
+            percentage = (count / total) * 100
+            write(f"- **{technique}**: {count} publishers ({percentage:.1f}%)\n")
+        
+        # Example phrases
+        write("\n## Notable Example Phrases\n\n")
+        
+        for (category_name, _, _), examples_found in zip(SUMMARY_EXAMPLE_CATEGORIES, stats['examples_found']):
+            write(f"### {category_name} Examples\n\n")
             
-            # Recommendations
-            f.write("## Recommendations\n\n")
-            f.write("Based on this analysis, publishers looking to optimize their subscription pages should consider:\n\n")
-            f.write("1. **Balance mission and features**: The most sophisticated publishers combine purpose-driven messaging with clear value propositions\n")
-            f.write("2. **Use behavioral triggers thoughtfully**: Social proof and reciprocity tend to be more effective than aggressive scarcity tactics\n")
-            f.write("3. **Build habits**: Emphasize daily utility and cross-platform accessibility\n")
-            f.write("4. **Create community**: Foster a sense of belonging and shared purpose among subscribers\n")
-            f.write("5. **Personalize the ask**: Use identity-affirming language that makes readers feel like valued partners\n")
+            for publisher, example in examples_found[:5]:  # Show top 5 examples
+                write(f"- **{publisher}**: \"{example}\"\n")
             
+            if not examples_found:
+                write("- No notable examples found\n")
+            write("\n")
+        
+        # Recommendations
+        write("## Recommendations\n\n")
+        write("Based on this analysis, publishers looking to optimize their subscription pages should consider:\n\n")
+        write("1. **Balance mission and features**: The most sophisticated publishers combine purpose-driven messaging with clear value propositions\n")
+        write("2. **Use behavioral triggers thoughtfully**: Social proof and reciprocity tend to be more effective than aggressive scarcity tactics\n")
+        write("3. **Build habits**: Emphasize daily utility and cross-platform accessibility\n")
+        write("4. **Create community**: Foster a sense of belonging and shared purpose among subscribers\n")
+        write("5. **Personalize the ask**: Use identity-affirming language that makes readers feel like valued partners\n")
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(''.join(parts))
+        
         logger.info(f"Saved summary report to {filepath}")
         return True
         
@@ -306,5 +378,5 @@ def save_progress(progress_data: Dict, output_dir: str):
     """
     progress_file = os.path.join(output_dir, 'progress.json')
     
-    with open(progress_file, 'w', encoding='utf-8') as f:
-        json.dump(progress_data, f, indent=2)
\ No newline at end of file
+    with open(progress_file, 'wb') as f:
+        f.write(json_utils.dumps(progress_data))
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""
+Bounded, persistent store for web app analysis results.
+Recent results are kept in memory; every result is also written to SQLite
+so repeated analyses survive restarts of the web app.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional
+
+from config.settings import settings
+from utils import json_utils
+
+logger = logging.getLogger(__name__)
+
+# Results database, stored in settings.CACHE_DIR
+RESULT_DB_NAME = 'web_results.sqlite'
+# Bump when the result layout changes so older entries are ignored
+RESULT_SCHEMA_VERSION = 2
+# Results kept in memory, evicted least recently used first
+MEMORY_RESULTS = 512
+# Results kept on disk, oldest removed first
+STORED_RESULTS = 5000
+# Rows read from disk per query while iterating over all results
+VALUES_PAGE_ROWS = 100
+
+
+class ResultStore:
+    """
+    Mapping-like result cache: `key in store`, `store[key]`, `store[key] = value`
+    and `store.values()` behave like the dict it replaces, with bounded memory.
+    """
+    
+    def __init__(self, db_path=None):
+        """
+        Initialize the store; the database is opened on first use.
+        
+        Args:
+            db_path: Database file (defaults to RESULT_DB_NAME in settings.CACHE_DIR)
+        """
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Open the results database, creating its table on first use.
+        
+        Must be called with _lock held.
+        
+        Returns:
+            SQLite connection in autocommit mode
+        """
+        if self._db is None:
+            if self.db_path is None:
+                settings.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                self.db_path = settings.CACHE_DIR / RESULT_DB_NAME
+            db = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute('CREATE TABLE IF NOT EXISTS results(key TEXT PRIMARY KEY, ts REAL NOT NULL, blob BLOB NOT NULL)')
+            db.execute('CREATE INDEX IF NOT EXISTS results_ts ON results(ts)')
+            self._db = db
+        return self._db
+    
+    @staticmethod
+    def _stored_key(key: str) -> str:
+        """Prefix a key with the schema version."""
+        return f"v{RESULT_SCHEMA_VERSION}:{key}"
+    
+    def _remember(self, key: str, result: Dict):
+        """Keep a result in memory; must be called with _lock held."""
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        if len(self._memory) > MEMORY_RESULTS:
+            self._memory.popitem(last=False)
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a result, loading it from disk if it is not in memory.
+        
+        Args:
+            key: Result key
+        
+        Returns:
+            Stored result or None
+        """
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                return result
+            
+            try:
+                row = self._connection().execute(
+                    'SELECT blob FROM results WHERE key = ?', (self._stored_key(key),)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Result lookup failed: {e}")
+                return None
+            if row is None:
+                return None
+            
+            try:
+                result = json_utils.loads(row[0])
+            except ValueError as e:
+                logger.warning(f"Invalid stored result {key}: {e}")
+                return None
+            self._remember(key, result)
+            return result
+    
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+    
+    def __getitem__(self, key: str) -> Dict:
+        result = self.get(key)
+        if result is None:
+            raise KeyError(key)
+        return result
+    
+    def __setitem__(self, key: str, result: Dict):
+        with self._lock:
+            self._remember(key, result)
+            try:
+                db = self._connection()
+                db.execute(
+                    'INSERT OR REPLACE INTO results(key, ts, blob) VALUES (?, ?, ?)',
+                    (self._stored_key(key), time.time(), json_utils.dumps(result, indent=False))
+                )
+                db.execute(
+                    'DELETE FROM results WHERE key IN '
+                    '(SELECT key FROM results ORDER BY ts DESC LIMIT -1 OFFSET ?)',
+                    (STORED_RESULTS,)
+                )
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"Failed to store result {key}: {e}")
+    
+    def values(self) -> Iterator[Dict]:
+        """
+        Iterate over all stored results of the current schema, oldest first.
+        
+        Results only held in memory (e.g. if the write to disk failed) come last.
+        
+        Yields:
+            Stored results
+        """
+        prefix = self._stored_key('')
+        with self._lock:
+            memory = dict(self._memory)
+        
+        # Keyset pagination on (ts, key): each page is a short query, so only
+        # one page of blobs is held at a time and writers are not blocked
+        last_ts, last_key = float('-inf'), ''
+        while True:
+            with self._lock:
+                try:
+                    rows = self._connection().execute(
+                        'SELECT key, ts, blob FROM results '
+                        'WHERE substr(key, 1, ?) = ? AND (ts > ? OR (ts = ? AND key > ?)) '
+                        'ORDER BY ts, key LIMIT ?',
+                        (len(prefix), prefix, last_ts, last_ts, last_key, VALUES_PAGE_ROWS)
+                    ).fetchall()
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to read stored results: {e}")
+                    rows = []
+            
+            for stored_key, ts, blob in rows:
+                key = stored_key[len(prefix):]
+                if key in memory:
+                    # The in-memory copy may carry fields added after it was stored
+                    yield memory.pop(key)
+                    continue
+                try:
+                    yield json_utils.loads(blob)
+                except ValueError as e:
+                    logger.warning(f"Invalid stored result {key}: {e}")
+            
+            if len(rows) < VALUES_PAGE_ROWS:
+                break
+            last_key, last_ts = rows[-1][0], rows[-1][1]
+        
+        yield from memory.values()
@@ -2,8 +2,12 @@
 Web scraping functions for extracting text from subscription pages.
 """
 
-import requests
+import importlib.util
+import httpx
 from bs4 import BeautifulSoup
+from bs4.dammit import UnicodeDammit
+import lxml.html
+from lxml import etree
 import time
 from typing import Optional, Dict
 import logging
@@ -12,6 +16,68 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# HTTP/2 lets concurrent fetches from one host share a connection; httpx needs the h2 package for it
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+# Shared client so repeat requests to a host reuse pooled keep-alive connections
+_CLIENT = httpx.Client(
+    http2=HTTP2_AVAILABLE,
+    headers={'User-Agent': USER_AGENT},
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    follow_redirects=True
+)
+
+# Tags whose text is extracted, in output order
+TARGET_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'span', 'div', 'button', 'a', 'li', 'label')
+# Client errors that can succeed on retry: request timeout and rate limiting
+RETRYABLE_CLIENT_ERRORS = frozenset((408, 429))
+# Non-content tags removed before text extraction
+_STRIP_TAGS = ('script', 'style', 'meta', 'link', 'noscript')
+
+
+def _extract_text(content: bytes, charset: Optional[str] = None) -> str:
+    """
+    Extract the text of the target tags from raw HTML.
+    
+    Every target tag contributes its whole stripped text, nested tags included,
+    grouped by tag in TARGET_TAGS order and in document order within a tag.
+    
+    Args:
+        content: Raw HTML bytes
+        charset: Encoding from the Content-Type header, if any; otherwise it is
+            detected from the page as BeautifulSoup does
+        
+    Returns:
+        Extracted text, whitespace not yet normalized
+    """
+    # Decode the way BeautifulSoup did (header charset, then the page's own
+    # declaration, then sniffing), so pages without a declaration still decode
+    markup = UnicodeDammit(content, [charset] if charset else [], is_html=True).unicode_markup
+    if not markup:
+        return ''
+    
+    # lxml parsers must not be shared between threads, so each call gets its own
+    parser = lxml.html.HTMLParser(encoding='utf-8')
+    try:
+        root = lxml.html.document_fromstring(markup.encode('utf-8'), parser=parser)
+    except etree.ParserError:
+        # Empty document
+        return ''
+    
+    # Drop non-content elements (keeping the text that follows them) and comments
+    etree.strip_elements(root, *_STRIP_TAGS, with_tail=False)
+    etree.strip_tags(root, etree.Comment)
+    
+    text_by_tag = {tag: [] for tag in TARGET_TAGS}
+    for element in root.iter(*TARGET_TAGS):
+        text = ''.join(part.strip() for part in element.itertext())
+        if len(text) > 2:  # Skip very short text
+            text_by_tag[element.tag].append(text)
+    
+    return ' '.join(text for texts in text_by_tag.values() for text in texts)
+
 
 def scrape_page(url: str, max_retries: int = 3, timeout: int = 30) -> Optional[str]:
     """
@@ -25,37 +91,21 @@ def scrape_page(url: str, max_retries: int = 3, timeout: int = 30) -> Optional[s
     Returns:
         Cleaned text content or None if failed
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     for attempt in range(max_retries):
         try:
             logger.info(f"Scraping {url} (attempt {attempt + 1}/{max_retries})")
             
-            response = requests.get(url, headers=headers, timeout=timeout)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(['script', 'style', 'meta', 'link', 'noscript']):
-                script.decompose()
+            response = _CLIENT.get(url, timeout=timeout)
             
-            # Extract text from relevant tags
-            text_elements = []
-            target_tags = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'span', 'div', 'button', 'a', 'li', 'label']
-            
-            for tag in target_tags:
-                elements = soup.find_all(tag)
-                for element in elements:
-                    text = element.get_text(strip=True)
-                    if text and len(text) > 2:  # Skip very short text
-                        text_elements.append(text)
+            # Other client errors (missing page, no access) will not change on retry
+            if response.is_client_error and response.status_code not in RETRYABLE_CLIENT_ERRORS:
+                logger.error(f"Client error for {url}: HTTP {response.status_code}")
+                return None
+            response.raise_for_status()
             
-            # Join all text elements
-            full_text = ' '.join(text_elements)
+            # Parse the raw bytes with lxml so the page's own charset declaration
+            # applies unless the Content-Type header names one
+            full_text = _extract_text(response.content, response.charset_encoding)
             
             # Clean up whitespace
             full_text = ' '.join(full_text.split())
@@ -66,17 +116,25 @@ def scrape_page(url: str, max_retries: int = 3, timeout: int = 30) -> Optional[s
             logger.info(f"Successfully scraped {url}: {len(full_text)} characters")
             return full_text
             
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.error(f"Timeout error for {url} (attempt {attempt + 1})")
-            time.sleep(2 ** attempt)  # Exponential backoff
             
-        except requests.exceptions.RequestException as e:
+        except (httpx.UnsupportedProtocol, httpx.TooManyRedirects) as e:
+            # Retrying the same URL cannot fix these
+            logger.error(f"Request error for {url}: {str(e)}")
+            return None
+            
+        except httpx.HTTPError as e:
+            # Connection failures and server errors are worth another attempt
             logger.error(f"Request error for {url} (attempt {attempt + 1}): {str(e)}")
-            time.sleep(2 ** attempt)
             
         except Exception as e:
             logger.error(f"Unexpected error for {url}: {str(e)}")
             return None
+        
+        # Exponential backoff, skipped when no attempts are left
+        if attempt + 1 < max_retries:
+            time.sleep(2 ** attempt)
     
     logger.error(f"Failed to scrape {url} after {max_retries} attempts")
     return None
@@ -124,14 +182,12 @@ def save_raw_html(url: str, output_path: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=30)
+        response = _CLIENT.get(url, timeout=30)
         response.raise_for_status()
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(response.text)
+        # Keep the bytes as served, so the page's charset declaration still matches them
+        with open(output_path, 'wb') as f:
+            f.write(response.content)
         
         logger.info(f"Saved HTML from {url} to {output_path}")
         return True
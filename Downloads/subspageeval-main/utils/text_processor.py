@@ -5,18 +5,29 @@ Text processing functions for cleaning and preparing text for analysis.
 import re
 from typing import List, Dict, Tuple
 from collections import Counter
+from functools import lru_cache
 import nltk
 from nltk.tokenize import word_tokenize
 import logging
 
-logger = logging.getLogger(__name__)
-
-# Try to download required NLTK data
 try:
-    nltk.download('punkt', quiet=True)
-except:
-    pass
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
 
+# Word tokens, matching the \b...\b boundaries used for single-word terms
+_TOKEN_RE = re.compile(r'\w+')
+# Patterns stripped by clean_text
+_URL_RE = re.compile(r'https?://\S+|www\.\S+')
+# Anchored at the start of a token: same matches as \S+@\S+, but linear
+# instead of rescanning long tokens without an '@' from every position
+_EMAIL_RE = re.compile(r'(?<!\S)\S+@\S+')
+# Whitespace that ' '.join(text.split()) would change, other than at the ends
+_IRREGULAR_WS_RE = re.compile(r'[^\S ]|  ')
+# Sentence boundaries for the simple splitter
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
 
 def clean_text(text: str) -> str:
     """
@@ -29,18 +40,71 @@ def clean_text(text: str) -> str:
         Cleaned text
     """
     # Remove URLs
-    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = _URL_RE.sub('', text)
     
     # Remove email addresses
-    text = re.sub(r'\S+@\S+', '', text)
+    if '@' in text:
+        text = _EMAIL_RE.sub('', text)
     
-    # Remove extra whitespace
+    # Remove extra whitespace; split/join is faster here than a regex substitution
     text = ' '.join(text.split())
     
     # Keep punctuation for now (needed for some patterns)
     return text
 
 
+# Common English words left out of word frequencies
+STOP_WORDS = frozenset({
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'her', 'was', 'one', 'our', 'out',
+    'his', 'has', 'had', 'were', 'been', 'have', 'their', 'they', 'will', 'with', 'this', 'that',
+    'from', 'what', 'which', 'when', 'where', 'who', 'why', 'how'
+})
+
+
+@lru_cache(maxsize=None)
+def _punkt_available() -> bool:
+    """
+    Check for NLTK's punkt tokenizer data, downloading it on first use if missing.
+    
+    Runs once per process, so importing this module never touches the network.
+    
+    Returns:
+        True if word_tokenize can be used
+    """
+    try:
+        nltk.data.find('tokenizers/punkt')
+        return True
+    except LookupError:
+        pass
+    
+    try:
+        return bool(nltk.download('punkt', quiet=True))
+    except Exception as e:
+        logger.warning(f"NLTK punkt data unavailable, using simple tokenization: {e}")
+        return False
+
+
+@lru_cache(maxsize=32)
+def _tokens(text: str) -> Tuple[str, ...]:
+    """
+    Tokenize text once; count_words and get_word_frequency on the same page share the result.
+    
+    Args:
+        text: Text to tokenize
+        
+    Returns:
+        Tuple of lowercase tokens
+    """
+    text_lower = text.lower()
+    if _punkt_available():
+        try:
+            return tuple(word_tokenize(text_lower))
+        except:
+            pass
+    # Fallback to simple tokenization if NLTK fails
+    return tuple(_TOKEN_RE.findall(text_lower))
+
+
 def tokenize_text(text: str) -> List[str]:
     """
     Tokenize text into words.
@@ -51,13 +115,7 @@ def tokenize_text(text: str) -> List[str]:
     Returns:
         List of tokens
     """
-    try:
-        tokens = word_tokenize(text.lower())
-    except:
-        # Fallback to simple tokenization if NLTK fails
-        tokens = re.findall(r'\b\w+\b', text.lower())
-    
-    return tokens
+    return list(_tokens(text))
 
 
 def count_words(text: str) -> int:
@@ -70,10 +128,97 @@ def count_words(text: str) -> int:
     Returns:
         Word count
     """
-    tokens = tokenize_text(text)
     # Filter out very short tokens
-    words = [t for t in tokens if len(t) > 1]
-    return len(words)
+    return sum(1 for t in _tokens(text) if len(t) > 1)
+
+
+@lru_cache(maxsize=2048)
+def _term_pattern(term_lower: str) -> re.Pattern:
+    """
+    Compile the search pattern for a lowercased term.
+    
+    Args:
+        term_lower: Lowercased term
+        
+    Returns:
+        Exact-match pattern for phrases, word-bounded pattern for single words
+    """
+    if ' ' in term_lower:
+        return re.compile(re.escape(term_lower))
+    return re.compile(r'\b' + re.escape(term_lower) + r'\b')
+
+
+@lru_cache(maxsize=1024)
+def _ignorecase_pattern(pattern: str) -> re.Pattern:
+    """
+    Compile a case-insensitive regex pattern.
+    
+    Args:
+        pattern: Regex pattern
+        
+    Returns:
+        Compiled pattern
+        
+    Raises:
+        re.error: If the pattern is invalid
+    """
+    return re.compile(pattern, re.IGNORECASE)
+
+
+@lru_cache(maxsize=128)
+def _term_automaton(term_keys: Tuple[str, ...]):
+    """
+    Build an Aho-Corasick automaton over lowercased terms.
+    
+    Args:
+        term_keys: Unique lowercased terms
+        
+    Returns:
+        Automaton whose values are the matched terms
+    """
+    automaton = ahocorasick.Automaton()
+    for term in term_keys:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _automaton_spans(text_lower: str, term_keys: Tuple[str, ...]) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Locate every term in a single pass over the text.
+    
+    Spans per term are the same ones the term's own regex finditer would
+    yield: single words must sit on word boundaries, and matches of one
+    term never overlap.
+    
+    Args:
+        text_lower: Lowercased text to scan
+        term_keys: Unique lowercased terms that are single words or phrases
+        
+    Returns:
+        Dictionary mapping each term to its (start, end) spans in text order
+    """
+    spans = {term: [] for term in term_keys}
+    text_length = len(text_lower)
+    
+    for last, term in _term_automaton(term_keys).iter(text_lower):
+        end = last + 1
+        start = end - len(term)
+        if ' ' not in term and (
+            (start > 0 and _is_word_char(text_lower[start - 1]))
+            or (end < text_length and _is_word_char(text_lower[end]))
+        ):
+            continue
+        term_spans = spans[term]
+        if term_spans and start < term_spans[-1][1]:
+            continue
+        term_spans.append((start, end))
+    
+    return spans
 
 
 def find_term_matches(text: str, terms: List[str]) -> Tuple[int, List[str]]:
@@ -88,26 +233,53 @@ def find_term_matches(text: str, terms: List[str]) -> Tuple[int, List[str]]:
         Tuple of (count, list of matched phrases)
     """
     text_lower = text.lower()
+    terms_lower = [term.lower() for term in terms]
+    tokens = None
     matches = []
+    text_length = len(text)
+    # Contexts from already-normalized text (e.g. clean_text output) only need stripping
+    normalized = None
+    
+    # With pyahocorasick, single words and phrases are all located in one pass;
+    # anything else (e.g. terms with punctuation at the edges) keeps its regex
+    spans = {}
+    if ahocorasick is not None:
+        term_keys = tuple(dict.fromkeys(
+            term for term in terms_lower if ' ' in term or _TOKEN_RE.fullmatch(term)
+        ))
+        if term_keys:
+            spans = _automaton_spans(text_lower, term_keys)
     
-    for term in terms:
-        term_lower = term.lower()
-        # Use word boundaries for single words, exact match for phrases
-        if ' ' in term:
-            # Multi-word phrase
-            pattern = re.escape(term_lower)
+    for term_lower in terms_lower:
+        if term_lower in spans:
+            found_spans = spans[term_lower]
         else:
-            # Single word with word boundaries
-            pattern = r'\b' + re.escape(term_lower) + r'\b'
+            # Skip the regex scan for terms that cannot occur: single words are
+            # checked against the token set, everything else by substring
+            if _TOKEN_RE.fullmatch(term_lower):
+                if tokens is None:
+                    tokens = frozenset(_TOKEN_RE.findall(text_lower))
+                if term_lower not in tokens:
+                    continue
+            elif term_lower not in text_lower:
+                continue
+            
+            # Use word boundaries for single words, exact match for phrases
+            found_spans = [match.span() for match in _term_pattern(term_lower).finditer(text_lower)]
         
-        found_matches = re.finditer(pattern, text_lower)
-        for match in found_matches:
+        if found_spans and normalized is None:
+            normalized = _IRREGULAR_WS_RE.search(text) is None
+        
+        for match_start, match_end in found_spans:
             # Extract context around the match (20 chars before and after)
-            start = max(0, match.start() - 20)
-            end = min(len(text), match.end() + 20)
+            start = match_start - 20 if match_start > 20 else 0
+            end = match_end + 20
+            if end > text_length:
+                end = text_length
             context = text[start:end].strip()
             # Clean up context
-            context = ' '.join(context.split())
+            if not normalized:
+                context = ' '.join(context.split())
             matches.append(context)
     
     return len(matches), matches[:10]  # Return top 10 examples
@@ -128,7 +300,7 @@ def find_pattern_matches(text: str, patterns: List[str]) -> Tuple[int, List[str]
     
     for pattern in patterns:
         try:
-            found_matches = re.finditer(pattern, text, re.IGNORECASE)
+            found_matches = _ignorecase_pattern(pattern).finditer(text)
             for match in found_matches:
                 matches.append(match.group(0))
         except re.error as e:
@@ -137,6 +309,20 @@ def find_pattern_matches(text: str, patterns: List[str]) -> Tuple[int, List[str]
     return len(matches), matches[:10]  # Return top 10 examples
 
 
+@lru_cache(maxsize=256)
+def _any_term_pattern(terms_lower: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile one alternation that finds any of the terms as a substring.
+    
+    Args:
+        terms_lower: Non-empty tuple of lowercased terms
+        
+    Returns:
+        Compiled pattern
+    """
+    return re.compile('|'.join(re.escape(term) for term in terms_lower))
+
+
 def extract_sentences_with_terms(text: str, terms: List[str], max_sentences: int = 5) -> List[str]:
     """
     Extract full sentences containing specific terms.
@@ -149,20 +335,23 @@ def extract_sentences_with_terms(text: str, terms: List[str], max_sentences: int
     Returns:
         List of sentences
     """
+    if not terms:
+        return []
+    
+    # One scan per sentence finds whether any term occurs in it
+    search = _any_term_pattern(tuple(term.lower() for term in terms)).search
+    
     # Simple sentence splitting
-    sentences = re.split(r'[.!?]+', text)
+    sentences = _SENTENCE_SPLIT_RE.split(text)
     matching_sentences = []
     
     for sentence in sentences:
         sentence = sentence.strip()
         if not sentence:
             continue
-            
-        sentence_lower = sentence.lower()
-        for term in terms:
-            if term.lower() in sentence_lower:
-                matching_sentences.append(sentence)
-                break
+        
+        if search(sentence.lower()):
+            matching_sentences.append(sentence)
         
         if len(matching_sentences) >= max_sentences:
             break
@@ -181,13 +370,9 @@ def get_word_frequency(text: str, min_length: int = 4) -> Dict[str, int]:
     Returns:
         Dictionary of word frequencies
     """
-    tokens = tokenize_text(text)
     # Filter out short words and common stop words
-    stop_words = {'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'her', 'was', 'one', 'our', 'out', 'his', 'has', 'had', 'were', 'been', 'have', 'their', 'they', 'will', 'with', 'this', 'that', 'from', 'what', 'which', 'when', 'where', 'who', 'why', 'how'}
-    
-    filtered_tokens = [t for t in tokens if len(t) >= min_length and t not in stop_words]
-    
-    return dict(Counter(filtered_tokens).most_common(50))
+    frequencies = Counter(t for t in _tokens(text) if len(t) >= min_length and t not in STOP_WORDS)
+    return dict(frequencies.most_common(50))
 
 
 def calculate_readability_metrics(text: str) -> Dict[str, float]:
@@ -200,11 +385,10 @@ def calculate_readability_metrics(text: str) -> Dict[str, float]:
     Returns:
         Dictionary of readability metrics
     """
-    sentences = re.split(r'[.!?]+', text)
+    sentences = _SENTENCE_SPLIT_RE.split(text)
     sentences = [s.strip() for s in sentences if s.strip()]
     
-    words = tokenize_text(text)
-    words = [w for w in words if len(w) > 1]
+    words = [w for w in _tokens(text) if len(w) > 1]
     
     if not sentences or not words:
         return {
@@ -2,24 +2,21 @@
 Flask web application for multilingual subscription page analysis using Claude AI.
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
+from concurrent.futures import ThreadPoolExecutor
+import csv
 import json
 import os
 import logging
 from datetime import datetime
-import base64
-from io import BytesIO
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-from typing import Dict, List
+from io import BytesIO, StringIO
+from typing import Dict, Iterable, Iterator, List
 
 from utils.scraper import scrape_page
 from utils.text_processor import clean_text
 from utils.analyzer import analyze_text, get_supported_languages
 from utils.reporter import save_individual_report
+from utils.result_store import ResultStore
 from config.settings import settings
 
 app = Flask(__name__)
@@ -30,8 +27,16 @@ app.config['SECRET_KEY'] = settings.FLASK_SECRET_KEY
 logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
-# Store analysis results in memory (in production, use a database)
-analysis_cache = {}
+# Recent analysis results in memory, all of them persisted to SQLite
+analysis_cache = ResultStore()
+
+# Pages fetched in parallel by /compare
+COMPARE_SCRAPE_WORKERS = 8
+
+
+def _cache_key(publisher_name: str, url: str, language: str) -> str:
+    """Key for analysis_cache; the language is part of it for multilingual support."""
+    return f"{publisher_name}_{url}_{language}"
 
 
 @app.route('/')
@@ -66,7 +71,7 @@ def analyze():
     
     try:
         # Check cache first (include language in cache key for multilingual support)
-        cache_key = f"{publisher_name}_{url}_{language}"
+        cache_key = _cache_key(publisher_name, url, language)
         if cache_key in analysis_cache:
             cached_result = analysis_cache[cache_key]
             cached_result['from_cache'] = True
@@ -122,24 +127,57 @@ def compare():
     logger.info(f"Comparing {len(urls)} publishers with default language: {default_language}")
     
     try:
-        all_results = []
+        # Start fetching every page that may be needed up front; pages are
+        # handled in input order below while later fetches are still running.
+        # Unnamed publishers get a name from their position, so they are
+        # fetched even if they may turn out to be cached
+        pending = [
+            index for index, item in enumerate(urls)
+            if 'publisher_name' not in item
+            or _cache_key(item['publisher_name'], item.get('url'), item.get('language', default_language)) not in analysis_cache
+        ]
+        scrape_executor = ThreadPoolExecutor(max_workers=max(1, min(COMPARE_SCRAPE_WORKERS, len(pending))))
+        # Claude calls run concurrently too, within the analyzer's own rate limits
+        analysis_executor = ThreadPoolExecutor(max_workers=settings.MAX_CONCURRENT_ANALYSES)
+        scrapes = {index: scrape_executor.submit(scrape_page, urls[index].get('url')) for index in pending}
         
-        for item in urls:
-            url = item.get('url')
-            publisher_name = item.get('publisher_name', f'Publisher {len(all_results) + 1}')
-            language = item.get('language', default_language)
-            
-            # Check cache (include language in cache key)
-            cache_key = f"{publisher_name}_{url}_{language}"
-            if cache_key in analysis_cache:
-                all_results.append(analysis_cache[cache_key])
-            else:
+        try:
+            # Each entry is a cached result or a running analysis, in input order
+            entries = []
+            analyses = {}
+            for index, item in enumerate(urls):
+                url = item.get('url')
+                publisher_name = item.get('publisher_name', f'Publisher {len(entries) + 1}')
+                language = item.get('language', default_language)
+                
+                # Check cache (include language in cache key); a repeated
+                # publisher shares the analysis already started for it
+                cache_key = _cache_key(publisher_name, url, language)
+                if cache_key in analyses:
+                    entries.append(analyses[cache_key])
+                    continue
+                if cache_key in analysis_cache:
+                    entries.append(analysis_cache[cache_key])
+                    continue
+                
                 # Analyze new URL
-                text = scrape_page(url)
-                screenshot, metadata = None, {}
+                text = scrapes[index].result() if index in scrapes else scrape_page(url)
                 if text:
                     cleaned_text = clean_text(text)
-                    results = analyze_text(cleaned_text, publisher_name, language)
+                    future = analysis_executor.submit(analyze_text, cleaned_text, publisher_name, language)
+                    analyses[cache_key] = (future, url, language, cache_key)
+                    entries.append(analyses[cache_key])
+            
+            all_results = []
+            finished = {}
+            for entry in entries:
+                if not isinstance(entry, tuple):
+                    all_results.append(entry)
+                    continue
+                
+                future, url, language, cache_key = entry
+                if cache_key not in finished:
+                    results = future.result()
                     results['url'] = url
                     results['requested_language'] = language
                     
@@ -147,8 +185,14 @@ def compare():
                     if 'sophistication_score' not in results:
                         results['sophistication_score'] = 0.0
                     
+                    # Results are only written from this request's thread
                     analysis_cache[cache_key] = results
-                    all_results.append(results)
+                    finished[cache_key] = results
+                all_results.append(finished[cache_key])
+        finally:
+            # Drop fetches and analyses that are no longer needed
+            scrape_executor.shutdown(wait=False, cancel_futures=True)
+            analysis_executor.shutdown(wait=False, cancel_futures=True)
         
         # Generate comparative visualizations
         comparison_data = {
@@ -170,22 +214,18 @@ def export_data(format):
         return jsonify({'error': 'Invalid format'}), 400
     
     try:
-        # Get all cached results
-        all_results = list(analysis_cache.values())
-        
         if format == 'csv':
-            df = create_dataframe_from_results(all_results)
-            csv_buffer = BytesIO()
-            df.to_csv(csv_buffer, index=False)
-            csv_buffer.seek(0)
-            return send_file(
-                csv_buffer,
+            # Rows are streamed as they are produced instead of building the whole file
+            filename = f'subscription_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+            return Response(
+                generate_export_csv(analysis_cache.values()),
                 mimetype='text/csv',
-                as_attachment=True,
-                download_name=f'subscription_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+                headers={'Content-Disposition': f'attachment; filename={filename}'}
             )
         
         elif format == 'json':
+            # Get all cached results
+            all_results = list(analysis_cache.values())
             json_data = json.dumps(all_results, indent=2)
             json_buffer = BytesIO(json_data.encode())
             return send_file(
@@ -202,83 +242,72 @@ def export_data(format):
 # Sophistication score calculation is now handled by Claude AI in the enhanced pipeline
 
 
-def generate_charts(results: Dict) -> Dict[str, str]:
-    """Generate visualization charts for a single analysis."""
+def generate_charts(results: Dict) -> Dict[str, Dict]:
+    """Generate chart data for a single analysis; the browser draws it with Chart.js."""
     charts = {}
     
     # Motivation Framework Pie Chart
-    plt.figure(figsize=(8, 6))
     motivation = results.get('motivation_framework', {}).get('counts', {})
     if sum(motivation.values()) > 0:
-        plt.pie(motivation.values(), labels=motivation.keys(), autopct='%1.1f%%')
-        plt.title('Motivation Framework Distribution')
-        buf = BytesIO()
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        charts['motivation_pie'] = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close()
+        charts['motivation_pie'] = {
+            'type': 'pie',
+            'title': 'Motivation Framework Distribution',
+            'labels': list(motivation.keys()),
+            'values': list(motivation.values())
+        }
     
     # Behavioral Triggers Bar Chart (now includes authority)
-    plt.figure(figsize=(12, 6))
     behavioral = results.get('behavioral_triggers', {})
     triggers = ['scarcity_score', 'social_proof_score', 'loss_aversion_score', 'reciprocity_score', 'authority_score']
     values = [behavioral.get(t, 0) * 100 for t in triggers]
     labels = ['Scarcity', 'Social Proof', 'Loss Aversion', 'Reciprocity', 'Authority']
     
-    plt.bar(labels, values)
-    plt.ylabel('Score (normalized)')
-    plt.title('Behavioral Triggers Analysis')
-    plt.ylim(0, 10)
-    plt.xticks(rotation=45, ha='right')
-    buf = BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight')
-    buf.seek(0)
-    charts['behavioral_bar'] = base64.b64encode(buf.read()).decode('utf-8')
-    plt.close()
+    charts['behavioral_bar'] = {
+        'type': 'bar',
+        'title': 'Behavioral Triggers Analysis',
+        'labels': labels,
+        'values': values,
+        'y_label': 'Score (normalized)',
+        'y_max': 10
+    }
     
     # Emotional Appeals Chart (new)
-    plt.figure(figsize=(10, 6))
     emotional = results.get('emotional_appeals', {})
     emotions = ['fear_score', 'hope_score', 'belonging_score', 'status_score']
     emotion_values = [emotional.get(e, 0) * 100 for e in emotions]
     emotion_labels = ['Fear', 'Hope', 'Belonging', 'Status']
     
     if sum(emotion_values) > 0:
-        plt.bar(emotion_labels, emotion_values, color=['red', 'green', 'blue', 'purple'])
-        plt.ylabel('Score (normalized)')
-        plt.title('Emotional Appeals Analysis')
-        plt.ylim(0, 10)
-        buf = BytesIO()
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        charts['emotional_bar'] = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close()
+        charts['emotional_bar'] = {
+            'type': 'bar',
+            'title': 'Emotional Appeals Analysis',
+            'labels': emotion_labels,
+            'values': emotion_values,
+            'colors': ['red', 'green', 'blue', 'purple'],
+            'y_label': 'Score (normalized)',
+            'y_max': 10
+        }
     
     return charts
 
 
-def generate_comparison_charts(results: List[Dict]) -> Dict[str, str]:
-    """Generate comparison charts for multiple publishers."""
+def generate_comparison_charts(results: List[Dict]) -> Dict[str, Dict]:
+    """Generate comparison chart data for multiple publishers."""
     charts = {}
     
     # Sophistication Score Comparison
-    plt.figure(figsize=(12, 6))
     publishers = [r['publisher_name'] for r in results]
     scores = [r.get('sophistication_score', 0) for r in results]
     
-    plt.bar(publishers, scores)
-    plt.ylabel('Sophistication Score (0-10)')
-    plt.title('Publisher Sophistication Comparison')
-    plt.xticks(rotation=45, ha='right')
-    buf = BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight')
-    buf.seek(0)
-    charts['sophistication_comparison'] = base64.b64encode(buf.read()).decode('utf-8')
-    plt.close()
+    charts['sophistication_comparison'] = {
+        'type': 'bar',
+        'title': 'Publisher Sophistication Comparison',
+        'labels': publishers,
+        'values': scores,
+        'y_label': 'Sophistication Score (0-10)'
+    }
     
     # Heatmap of all metrics
-    plt.figure(figsize=(14, 8))
-    
     # Prepare data for heatmap
     metrics = []
     metric_names = [
@@ -301,60 +330,99 @@ def generate_comparison_charts(results: List[Dict]) -> Dict[str, str]:
         
         metrics.append(row)
     
-    sns.heatmap(
-        metrics,
-        annot=True,
-        fmt='.2f',
-        xticklabels=metric_names,
-        yticklabels=publishers,
-        cmap='YlOrRd'
-    )
-    plt.title('Linguistic Strategy Heatmap')
-    plt.tight_layout()
-    buf = BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight')
-    buf.seek(0)
-    charts['strategy_heatmap'] = base64.b64encode(buf.read()).decode('utf-8')
-    plt.close()
+    charts['strategy_heatmap'] = {
+        'type': 'heatmap',
+        'title': 'Linguistic Strategy Heatmap',
+        'x_labels': metric_names,
+        'y_labels': publishers,
+        'values': metrics
+    }
     
     return charts
 
 
 def generate_summary_stats(results: List[Dict]) -> Dict:
     """Generate summary statistics for comparison."""
+    # One pass tracks the total and each leader; ties keep the first publisher, as max() did
+    total_sophistication = 0
+    most_sophisticated = most_mission_driven = most_community_focused = None
+    for r in results:
+        sophistication = r.get('sophistication_score', 0)
+        motivation = r.get('motivation_framework', {})
+        mission = motivation.get('mission_density', 0)
+        community = motivation.get('community_score', 0)
+        total_sophistication += sophistication
+        
+        if most_sophisticated is None or sophistication > most_sophisticated[0]:
+            most_sophisticated = (sophistication, r)
+        if most_mission_driven is None or mission > most_mission_driven[0]:
+            most_mission_driven = (mission, r)
+        if most_community_focused is None or community > most_community_focused[0]:
+            most_community_focused = (community, r)
+    
     stats = {
         'total_publishers': len(results),
-        'avg_sophistication': round(sum(r.get('sophistication_score', 0) for r in results) / len(results), 2),
-        'most_sophisticated': max(results, key=lambda x: x.get('sophistication_score', 0))['publisher_name'],
-        'most_mission_driven': max(results, key=lambda x: x.get('motivation_framework', {}).get('mission_density', 0))['publisher_name'],
-        'most_community_focused': max(results, key=lambda x: x.get('motivation_framework', {}).get('community_score', 0))['publisher_name']
+        'avg_sophistication': round(total_sophistication / len(results), 2),
+        'most_sophisticated': most_sophisticated[1]['publisher_name'],
+        'most_mission_driven': most_mission_driven[1]['publisher_name'],
+        'most_community_focused': most_community_focused[1]['publisher_name']
     }
     return stats
 
 
-def create_dataframe_from_results(results: List[Dict]) -> pd.DataFrame:
-    """Create a pandas DataFrame from analysis results."""
-    data = []
+# Column order of the CSV export; _export_row yields values in this order
+EXPORT_CSV_FIELDS = (
+    'Publisher', 'URL', 'Sophistication Score', 'Total Words', 'Support Ratio',
+    'Mission Density', 'Scarcity Score', 'Social Proof Score', 'Timestamp'
+)
+# Bytes of CSV text collected before a chunk is sent
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _export_row(r: Dict) -> tuple:
+    """Flatten one analysis result into a CSV export row."""
+    motivation = r.get('motivation_framework', {})
+    behavioral = r.get('behavioral_triggers', {})
+    return (
+        r.get('publisher_name'),
+        r.get('url'),
+        r.get('sophistication_score', 0),
+        r.get('total_words', 0),
+        motivation.get('support_ratio', 0),
+        motivation.get('mission_density', 0),
+        behavioral.get('scarcity_score', 0),
+        behavioral.get('social_proof_score', 0),
+        r.get('timestamp', '')
+    )
+
+
+def generate_export_csv(results: Iterable[Dict]) -> Iterator[str]:
+    """
+    Produce the CSV export incrementally.
     
-    for r in results:
-        row = {
-            'Publisher': r.get('publisher_name'),
-            'URL': r.get('url'),
-            'Sophistication Score': r.get('sophistication_score', 0),
-            'Total Words': r.get('total_words', 0),
-            'Support Ratio': r.get('motivation_framework', {}).get('support_ratio', 0),
-            'Mission Density': r.get('motivation_framework', {}).get('mission_density', 0),
-            'Scarcity Score': r.get('behavioral_triggers', {}).get('scarcity_score', 0),
-            'Social Proof Score': r.get('behavioral_triggers', {}).get('social_proof_score', 0),
-            'Timestamp': r.get('timestamp', '')
-        }
-        data.append(row)
+    Args:
+        results: Analysis results, consumed lazily
+        
+    Yields:
+        Chunks of CSV text, header first
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(EXPORT_CSV_FIELDS)
+    
+    for result in results:
+        writer.writerow(_export_row(result))
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
     
-    return pd.DataFrame(data)
+    yield buffer.getvalue()
 
 
 if __name__ == '__main__':
     # Create necessary directories
+    settings.bootstrap()
     os.makedirs('templates', exist_ok=True)
     os.makedirs('static', exist_ok=True)
     